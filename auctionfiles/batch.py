@@ -0,0 +1,281 @@
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Resource-bounded batch mode.
+#
+# PDFs are extracted and parsed in worker processes; the main process is the
+# writer. Records are spilled to a JSON-lines file as they arrive instead of
+# being held until the end, and the number of files in flight shrinks to one
+# while the RSS of the writer and its workers is above the ceiling.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+DEFAULT_MEMORY_LIMIT_MB = 1024
+DEFAULT_WORKERS = max(1, min(4, (os.cpu_count() or 1) - 1))
+# Records buffered by the writer before they are spilled to disk
+SPILL_ROWS = 2000
+# Seconds between memory checks while files are in flight
+SAMPLE_INTERVAL = 0.2
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB, or None if it can't be read."""
+    try:
+        with open(f"/proc/{pid}/status") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+    except psutil.Error:
+        return None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak RSS of this process and its finished children, from getrusage."""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+    return max(own, children)
+
+
+def _extract_and_parse(pdf_path: str) -> Tuple[str, List[Dict[str, Any]], int]:
+    """Extract and parse one PDF. Runs in a worker process."""
+    from dc4 import extract_pages, parse_entries
+    from pages import clean_pages, iter_entries
+
+    page_texts, empty_pages = extract_pages(pdf_path)
+    records = parse_entries(iter_entries(clean_pages(page_texts)))
+    return pdf_path, records, len(empty_pages)
+
+
+class MemoryMonitor:
+    """Tracks the combined RSS of the writer and its worker processes."""
+
+    def __init__(self, limit_mb: float):
+        self.limit_mb = limit_mb
+        self.peak_mb = 0.0
+        self.samples = 0
+
+    def current_mb(self, executor: Optional[ProcessPoolExecutor] = None) -> Optional[float]:
+        pids = [os.getpid()]
+        # No public API lists the pool's processes
+        processes = getattr(executor, "_processes", None) or {}
+        pids.extend(processes)
+        sizes = [_rss_mb(pid) for pid in pids]
+        sizes = [size for size in sizes if size is not None]
+        if not sizes:
+            return None
+        total = sum(sizes)
+        self.peak_mb = max(self.peak_mb, total)
+        self.samples += 1
+        return total
+
+    def over_limit(self, executor: Optional[ProcessPoolExecutor] = None) -> bool:
+        current = self.current_mb(executor)
+        return current is not None and current > self.limit_mb
+
+
+class SpillWriter:
+    """Appends records to a JSON-lines spill file and assembles the CSV at the end."""
+
+    def __init__(self, spill_dir: str, spill_rows: int = SPILL_ROWS):
+        self.spill_rows = spill_rows
+        self.columns: Dict[str, None] = {}
+        self.rows = 0
+        self.spills = 0
+        self._buffer: List[Dict[str, Any]] = []
+        handle, self.path = tempfile.mkstemp(prefix="auction_spill_", suffix=".jsonl", dir=spill_dir)
+        self._file = os.fdopen(handle, "w", encoding="utf-8")
+
+    def add(self, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            self.columns.update(dict.fromkeys(record))
+            self._buffer.append(record)
+            self.rows += 1
+        if len(self._buffer) >= self.spill_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        for record in self._buffer:
+            self._file.write(json.dumps(record, ensure_ascii=False))
+            self._file.write("\n")
+        self._file.flush()
+        self._buffer.clear()
+        self.spills += 1
+
+    def write_csv(self, output_csv: str) -> None:
+        """Stream the spilled records into a CSV with the union of all columns."""
+        self.flush()
+        self._file.close()
+        tmp_path = f"{output_csv}.tmp"
+        with open(self.path, encoding="utf-8") as source, \
+                open(tmp_path, "w", encoding="utf-8", newline="") as target:
+            writer = csv.DictWriter(target, fieldnames=list(self.columns))
+            writer.writeheader()
+            for line in source:
+                writer.writerow(json.loads(line))
+        os.replace(tmp_path, output_csv)
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def write_checkpoint_csv(checkpoint, pdf_paths: List[str], output_csv: str) -> int:
+    """Stream a checkpoint's records into a CSV in file order and return the row count."""
+    columns = checkpoint.columns(pdf_paths)
+    if not columns:
+        return 0
+    rows = 0
+    tmp_path = f"{output_csv}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as target:
+        writer = csv.DictWriter(target, fieldnames=columns)
+        writer.writeheader()
+        for record in checkpoint.iter_records(pdf_paths):
+            writer.writerow(record)
+            rows += 1
+    os.replace(tmp_path, output_csv)
+    return rows
+
+
+def process_folder_bounded(folder_path: str, output_csv: str,
+                           memory_limit_mb: float = DEFAULT_MEMORY_LIMIT_MB,
+                           workers: int = DEFAULT_WORKERS, spill_rows: int = SPILL_ROWS,
+                           spill_dir: Optional[str] = None,
+                           checkpoint_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Process a folder of PDFs under a memory ceiling.
+
+    Args:
+        folder_path: Folder containing the Artnet PDF exports
+        output_csv: Path of the combined CSV
+        memory_limit_mb: RSS ceiling for the writer plus its workers
+        workers: Number of extraction processes
+        spill_rows: Records buffered before they are spilled to disk
+        spill_dir: Directory for the spill file (default: next to output_csv)
+        checkpoint_dir: Commit each file's records here instead of the spill
+            file; a rerun with the same arguments skips the committed files and
+            writes the CSV in file order, whichever worker finished first
+
+    Returns:
+        dict: Run report, including the peak memory observed
+    """
+    if not os.path.exists(folder_path):
+        raise FileNotFoundError(f"Folder not found: {folder_path}")
+    pdf_files = sorted(f for f in os.listdir(folder_path) if f.lower().endswith('.pdf'))
+    if not pdf_files:
+        raise ValueError(f"No PDF files found in {folder_path}")
+
+    monitor = MemoryMonitor(memory_limit_mb)
+    spill = SpillWriter(spill_dir or os.path.dirname(os.path.abspath(output_csv)), spill_rows)
+    pdf_paths = [os.path.join(folder_path, pdf_file) for pdf_file in pdf_files]
+    report = {"files": len(pdf_files), "failed_files": 0, "empty_pages": 0, "throttled_seconds": 0.0}
+    start = time.perf_counter()
+
+    checkpoint = None
+    if checkpoint_dir:
+        from checkpoint import Checkpoint, run_fingerprint
+
+        checkpoint = Checkpoint(checkpoint_dir, run_fingerprint(folder_path)).open()
+    pending = [path for path in reversed(pdf_paths) if checkpoint is None or not checkpoint.is_done(path)]
+    report["resumed_files"] = len(pdf_paths) - len(pending)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight = set()
+            paths = {}
+            while pending or in_flight:
+                # Backpressure: keep one file in flight while over the ceiling
+                over_limit = monitor.over_limit(executor)
+                limit = 1 if over_limit else workers
+                while pending and len(in_flight) < limit:
+                    pdf_path = pending.pop()
+                    future = executor.submit(_extract_and_parse, pdf_path)
+                    paths[future] = pdf_path
+                    in_flight.add(future)
+                if over_limit:
+                    spill.flush()
+
+                throttle_start = time.perf_counter()
+                done, in_flight = wait(
+                    in_flight, timeout=SAMPLE_INTERVAL, return_when=FIRST_COMPLETED,
+                )
+                if over_limit:
+                    report["throttled_seconds"] += time.perf_counter() - throttle_start
+
+                for future in done:
+                    pdf_path = paths.pop(future)
+                    try:
+                        _, records, empty_pages = future.result()
+                    except Exception as e:
+                        print(f"Error processing {os.path.basename(pdf_path)}: {str(e)}")
+                        report["failed_files"] += 1
+                        if checkpoint is not None:
+                            checkpoint.discard(pdf_path)
+                        continue
+                    if checkpoint is not None:
+                        checkpoint.record(pdf_path, records)
+                    else:
+                        spill.add(records)
+                    report["empty_pages"] += empty_pages
+                    print(f"Extracted {len(records)} records from {os.path.basename(pdf_path)}")
+                    del records
+
+        monitor.current_mb()
+        if checkpoint is not None:
+            checkpoint.commit()
+            rows = write_checkpoint_csv(checkpoint, pdf_paths, output_csv)
+        else:
+            rows = spill.rows
+            if rows:
+                spill.write_csv(output_csv)
+        if rows:
+            print(f"\nData saved to {output_csv}")
+        else:
+            print("Warning: No auction data extracted from any files")
+    finally:
+        spill.close()
+        if checkpoint is not None:
+            checkpoint.close()
+
+    report.update({
+        "records": rows,
+        "spills": spill.spills,
+        "seconds": time.perf_counter() - start,
+        "memory_limit_mb": memory_limit_mb,
+        "peak_rss_mb": monitor.peak_mb,
+        "peak_rss_getrusage_mb": _peak_rss_mb(),
+    })
+    print(
+        f"Total records extracted: {report['records']} "
+        f"(peak RSS {report['peak_rss_mb']:.0f} MB of {memory_limit_mb:.0f} MB ceiling, "
+        f"{report['spills']} spills, throttled {report['throttled_seconds']:.1f}s)"
+    )
+    return report
@@ -0,0 +1,252 @@
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+# Run from anywhere: python auctionfiles/benchmark.py
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+# Modules that must not be pulled in by importing the parser
+HEAVY_MODULES = ("pandas", "pdfplumber", "PyPDF2", "numpy", "multiprocessing")
+
+IMPORT_REPEATS = 5
+
+SAMPLE_ENTRY = """{n} Avery Singer
+Title Untitled (Study)
+Description Avery Singerb. 1987Untitled (Study)signed and
+dated 2016 (on the reverse)a
+Medium acrylic on gessoed board
+Year of Work 2016
+Size Height 30 in.; Width 38.8 in. / Height 76.2 cm.;
+Width 98.5 cm.
+Misc. Signed
+Sale of Sotheby's London: Thursday, October 10, 2024
+[Lot 00151]
+Contemporary Day Auction
+Estimate 20,000 - 30,000 GBP
+(26,106 - 39,159 USD)
+Sold For 441,000 HKD Premium
+(56,724 USD)"""
+
+# Price patterns before prices.py, kept as the speed reference for PRICE_PATTERN
+LEGACY_PRICE_PATTERNS = (
+    r'^((?:\d{1,3}(?:,\d{3})*(?:\.\d+)?|\d+)\s*(?:-|to)\s*(?:\d{1,3}(?:,\d{3})*(?:\.\d+)?|\d+)\s*'
+    r'(?:USD|GBP|HKD|CNY|AUD|EUR|SGD)(?:\s*\(.*?\))?)',
+    r'^((?:[\d,]+\s*[A-Z]{3})|(?:Bought In)|(?:Withdrawn)|(?:Passed)|(?:Not Sold))'
+    r'(?:\s*(?:Premium|Hammer))?(?:\s*\(([\d,]+\s*USD)\))?',
+)
+# The table-driven pattern captures every number the legacy ones left as text,
+# which costs about 1.5x on the lines both match; fail well before the wider
+# currency table becomes the bottleneck
+PRICE_SLOWDOWN_LIMIT = 2.0
+
+# Runaway entries that once took seconds each: a lazy pattern over a label that
+# never closes, or fallbacks whose unbounded gaps backtrack over a long
+# Description. Every pattern is bounded by input size, so each must stay fast.
+_RUNAWAY_HEAD = "1 Avery Singer\nTitle Untitled\n"
+PATHOLOGICAL_ENTRIES = {
+    "sale without lot": _RUNAWAY_HEAD + "Sale of Sotheby's London: " + "word " * 8000,
+    "repeated size labels": _RUNAWAY_HEAD + "Size " + "Size Height " * 3000,
+    "signed then dated": _RUNAWAY_HEAD + "Description " + "signed " * 150 + "dated " * 500,
+    "signed dated": _RUNAWAY_HEAD + "Description " + "signed dated " * 400,
+    "oil on": _RUNAWAY_HEAD + "Description " + "oil on " * 2000,
+}
+PATHOLOGICAL_LIMIT = 0.25  # seconds per entry
+
+_IMPORT_PROBE = """
+import sys, time
+sys.path.insert(0, {here!r})
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(elapsed, ",".join(heavy))
+"""
+
+
+def measure_import(module: str = "dc4", repeats: int = IMPORT_REPEATS) -> Dict[str, Any]:
+    """
+    Time a cold import of a module in fresh interpreters.
+
+    Args:
+        module: Module to import
+        repeats: Number of interpreters to start; the fastest run is kept
+
+    Returns:
+        dict: Best import time in milliseconds and any heavy modules it loaded
+    """
+    probe = _IMPORT_PROBE.format(here=HERE, module=module, heavy=HEAVY_MODULES)
+    timings = []
+    heavy: List[str] = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", probe], check=True, capture_output=True, text=True
+        ).stdout.split()
+        timings.append(float(output[0]) * 1000)
+        heavy = output[1].split(",") if len(output) > 1 else []
+    return {"module": module, "import_ms": min(timings), "heavy_modules": heavy}
+
+
+def synthetic_text(entries: int = 2000) -> str:
+    """Build an export-like text with the given number of lots."""
+    return "\n".join(SAMPLE_ENTRY.format(n=n) for n in range(1, entries + 1)) + "\n"
+
+
+def measure_parse(entries: int = 2000) -> Dict[str, Any]:
+    """Time parse_auction_data over a synthetic document."""
+    from dc4 import parse_auction_data
+
+    text = synthetic_text(entries)
+    start = time.perf_counter()
+    records = parse_auction_data(text)
+    elapsed = time.perf_counter() - start
+    return {
+        "entries": entries,
+        "records": len(records),
+        "seconds": elapsed,
+        "entries_per_second": entries / elapsed if elapsed else float("inf"),
+    }
+
+
+def measure_pathological() -> Dict[str, float]:
+    """Time parse_entries on each runaway entry."""
+    from dc4 import parse_entries
+
+    seconds = {}
+    for name, entry in PATHOLOGICAL_ENTRIES.items():
+        start = time.perf_counter()
+        parse_entries([entry])
+        seconds[name] = time.perf_counter() - start
+    return seconds
+
+
+def price_lines() -> List[Tuple[str, str]]:
+    """Estimate and Sold For values in every currency of the table, plus lot statuses."""
+    from prices import CURRENCIES, LOT_STATUSES
+
+    lines = []
+    for code in CURRENCIES:
+        conversion = "" if code == "USD" else "\n(26,106 - 39,159 USD)"
+        lines.append(("estimate", f"20,000 - 30,000 {code}{conversion}"))
+        lines.append(("estimate", f"1,500,000 {code}"))
+        lines.append(("sold", f"441,000 {code} Premium" + ("" if code == "USD" else "\n(56,724 USD)")))
+        lines.append(("sold", f"12,500.50 {code} Hammer"))
+    lines.extend(("sold", status) for status in LOT_STATUSES)
+    return lines
+
+
+def _best_seconds(match_lines: List[Any], lines: List[Tuple[str, str]], repeats: int,
+                  rounds: int = 9) -> List[float]:
+    """
+    Fastest pass of each match_line(kind, line) over the lines.
+
+    The functions are timed in alternation so that load on the machine hits
+    them alike.
+    """
+    best = [float("inf")] * len(match_lines)
+    for _ in range(rounds):
+        for position, match_line in enumerate(match_lines):
+            start = time.perf_counter()
+            for _ in range(repeats):
+                for kind, line in lines:
+                    match_line(kind, line)
+            best[position] = min(best[position], time.perf_counter() - start)
+    return best
+
+
+def measure_prices(repeats: int = 300) -> Dict[str, Any]:
+    """
+    Time the price pattern and its cleaners against the legacy patterns.
+
+    The slowdown is measured on the lines the legacy patterns also match, so
+    both sides do the same work.
+
+    Returns:
+        dict: Lines per second, the slowdown against the legacy patterns, and
+        the lines the table-driven pattern failed to turn into numbers
+    """
+    import re
+
+    from prices import PRICE_RE, estimate_columns, sold_columns
+
+    lines = price_lines()
+    legacy = [re.compile(pattern, re.DOTALL) for pattern in LEGACY_PRICE_PATTERNS]
+    cleaners = {"estimate": estimate_columns, "sold": sold_columns}
+
+    def parse(kind: str, line: str) -> Dict[str, Any]:
+        match = PRICE_RE.match(line)
+        return cleaners[kind](match) if match else {}
+
+    def legacy_match(kind: str, line: str) -> Any:
+        return legacy[0 if kind == "estimate" else 1].match(line)
+
+    missed = [
+        line for kind, line in lines
+        if not (PRICE_RE.match(line) and (parse(kind, line).get("Estimate Low") or
+                                          parse(kind, line).get("Sold Currency") or
+                                          PRICE_RE.match(line).group("status")))
+    ]
+    shared = [(kind, line) for kind, line in lines if legacy_match(kind, line)]
+
+    parse_seconds, = _best_seconds([parse], lines, repeats)
+    table_seconds, legacy_seconds = _best_seconds(
+        [lambda kind, line: PRICE_RE.match(line), legacy_match], shared, repeats,
+    )
+    return {
+        "lines": len(lines),
+        "lines_per_second": repeats * len(lines) / parse_seconds,
+        "legacy_coverage": len(shared) / len(lines),
+        "slowdown": table_seconds / legacy_seconds,
+        "missed": missed,
+    }
+
+
+def main() -> int:
+    """Run the benchmarks and return a non-zero exit code on regressions."""
+    failed = False
+
+    for module in ("dc4", "dimensions", "pages", "prices", "quality"):
+        result = measure_import(module)
+        print(f"import {module}: {result['import_ms']:.1f} ms")
+        if result["heavy_modules"]:
+            print(f"  FAIL: importing {module} loaded {', '.join(result['heavy_modules'])}")
+            failed = True
+
+    result = measure_parse()
+    print(
+        f"parse_auction_data: {result['entries']} entries in {result['seconds']:.3f}s "
+        f"({result['entries_per_second']:.0f} entries/s)"
+    )
+    if result["records"] != result["entries"]:
+        print(f"  FAIL: parsed {result['records']} of {result['entries']} entries")
+        failed = True
+
+    seconds = measure_pathological()
+    slowest = max(seconds, key=seconds.get)
+    print(f"runaway entries: {len(seconds)} parsed, slowest {slowest!r} in {seconds[slowest]:.3f}s")
+    for name, elapsed in seconds.items():
+        if elapsed > PATHOLOGICAL_LIMIT:
+            print(f"  FAIL: runaway entry {name!r} took {elapsed:.2f}s (limit {PATHOLOGICAL_LIMIT}s)")
+            failed = True
+
+    result = measure_prices()
+    print(
+        f"price lines: {result['lines_per_second']:.0f} lines/s parsed to numbers; "
+        f"{result['slowdown']:.2f}x the legacy patterns' time on the "
+        f"{result['legacy_coverage']:.0%} of lines they cover"
+    )
+    if result["missed"]:
+        print(f"  FAIL: {len(result['missed'])} price lines not parsed, e.g. {result['missed'][0]!r}")
+        failed = True
+    if result["slowdown"] > PRICE_SLOWDOWN_LIMIT:
+        print(f"  FAIL: price parsing is {result['slowdown']:.2f}x slower than the legacy patterns")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Resumable checkpoints for long ingestion runs.
+#
+#   <directory>/state.json        run fingerprint and the files committed so far
+#   <directory>/parts/<id>.jsonl  parsed records of one completed file
+#   <directory>/.lock             held by the run using the directory
+#
+# Only the writer process touches the checkpoint; workers just return records.
+# Part files and state are written to a temporary name and renamed, so a crash
+# at any point leaves the last committed state intact. Final output is always
+# assembled from the parts in sorted file order, which makes a resumed run
+# produce exactly the output of an uninterrupted one.
+
+STATE_NAME = "state.json"
+PARTS_DIR = "parts"
+LOCK_NAME = ".lock"
+STATE_VERSION = 1
+
+# Commit state after this many completed files or seconds, whichever comes first
+COMMIT_EVERY = 10
+COMMIT_INTERVAL = 60.0
+
+
+class CheckpointError(Exception):
+    """Raised when a checkpoint directory belongs to a different run or is in use."""
+
+
+def _atomic_write(path: str, text: str) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def file_signature(path: str) -> Dict[str, int]:
+    """Size and modification time, used to notice inputs that changed since a checkpoint."""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+class Checkpoint:
+    """
+    Tracks which input files of a run are done and stores their records.
+
+    Usage:
+        with Checkpoint(directory, {"folder": folder_path}) as checkpoint:
+            for pdf_path in pdf_paths:
+                if not checkpoint.is_done(pdf_path):
+                    checkpoint.record(pdf_path, parse(pdf_path))
+            records = list(checkpoint.iter_records(pdf_paths))
+    """
+
+    def __init__(self, directory: str, fingerprint: Dict[str, Any],
+                 every: int = COMMIT_EVERY, interval: float = COMMIT_INTERVAL):
+        self.directory = directory
+        self.fingerprint = fingerprint
+        self.every = every
+        self.interval = interval
+        self.resumed = 0
+        self._state: Dict[str, Any] = {"version": STATE_VERSION, "fingerprint": fingerprint, "completed": {}}
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+        self._locked = False
+
+    def open(self) -> "Checkpoint":
+        """Lock the directory and load any committed state."""
+        os.makedirs(os.path.join(self.directory, PARTS_DIR), exist_ok=True)
+        self._acquire_lock()
+        try:
+            self._load()
+        except Exception:
+            self._release_lock()
+            raise
+        return self
+
+    def close(self) -> None:
+        """Commit outstanding progress and release the lock."""
+        try:
+            self.commit()
+        finally:
+            self._release_lock()
+
+    def _acquire_lock(self) -> None:
+        lock_path = os.path.join(self.directory, LOCK_NAME)
+        for _ in range(2):
+            try:
+                handle = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    with open(lock_path) as file:
+                        pid = int(file.read().strip() or 0)
+                except (OSError, ValueError):
+                    pid = 0
+                if pid and _pid_alive(pid):
+                    raise CheckpointError(f"Checkpoint {self.directory} is in use by process {pid}")
+                os.remove(lock_path)  # left behind by a run that died
+                continue
+            with os.fdopen(handle, "w") as file:
+                file.write(str(os.getpid()))
+            self._locked = True
+            return
+        raise CheckpointError(f"Could not lock checkpoint {self.directory}")
+
+    def _release_lock(self) -> None:
+        if self._locked:
+            os.remove(os.path.join(self.directory, LOCK_NAME))
+            self._locked = False
+
+    def __enter__(self) -> "Checkpoint":
+        return self.open()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _load(self) -> None:
+        state_path = os.path.join(self.directory, STATE_NAME)
+        if not os.path.exists(state_path):
+            return
+        with open(state_path, encoding="utf-8") as file:
+            state = json.load(file)
+        if state.get("version") != STATE_VERSION or state.get("fingerprint") != self.fingerprint:
+            raise CheckpointError(
+                f"Checkpoint {self.directory} was written by a run with different arguments; "
+                "use another directory or delete it"
+            )
+        self._state = state
+        self.resumed = len(state["completed"])
+        if self.resumed:
+            print(f"Resuming from checkpoint: {self.resumed} files already done")
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.basename(path)
+
+    def _part_path(self, key: str) -> str:
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, PARTS_DIR, f"{name}.jsonl")
+
+    def is_done(self, path: str) -> bool:
+        """Return True if the file was committed and has not changed since."""
+        key = self._key(path)
+        entry = self._state["completed"].get(key)
+        if entry is None or entry["signature"] != file_signature(path):
+            return False
+        return os.path.exists(self._part_path(key))
+
+    def record(self, path: str, records: List[Dict[str, Any]]) -> None:
+        """Store a completed file's records; state is committed periodically."""
+        key = self._key(path)
+        _atomic_write(
+            self._part_path(key),
+            "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records),
+        )
+        self._state["completed"][key] = {"signature": file_signature(path), "records": len(records)}
+        self._uncommitted += 1
+        if self._uncommitted >= self.every or time.monotonic() - self._last_commit >= self.interval:
+            self.commit()
+
+    def discard(self, path: str) -> None:
+        """Forget a file whose re-parse failed, so stale records never reach the output."""
+        key = self._key(path)
+        if self._state["completed"].pop(key, None) is not None:
+            self._uncommitted += 1
+        part_path = self._part_path(key)
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+    def commit(self) -> None:
+        """Atomically write the progress state."""
+        if not self._uncommitted and os.path.exists(os.path.join(self.directory, STATE_NAME)):
+            return
+        _atomic_write(os.path.join(self.directory, STATE_NAME), json.dumps(self._state, indent=1, ensure_ascii=False))
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+    def iter_records(self, paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Yield the stored records of the given files that are done, in the given order."""
+        for path in paths:
+            if not self.is_done(path):
+                continue
+            part_path = self._part_path(self._key(path))
+            with open(part_path, encoding="utf-8") as file:
+                for line in file:
+                    yield json.loads(line)
+
+    def columns(self, paths: Iterable[str]) -> List[str]:
+        """Union of record columns in first-seen order, as pandas.DataFrame would build it."""
+        columns: Dict[str, None] = {}
+        for record in self.iter_records(paths):
+            columns.update(dict.fromkeys(record))
+        return list(columns)
+
+
+def run_fingerprint(folder_path: str, **options: Optional[Any]) -> Dict[str, Any]:
+    """Describe the arguments of a run; a checkpoint only resumes a run with the same ones."""
+    fingerprint: Dict[str, Any] = {"folder": os.path.abspath(folder_path)}
+    fingerprint.update(options)
+    return fingerprint
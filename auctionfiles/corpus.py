@@ -0,0 +1,295 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Extracted-text corpus for re-parsing experiments.
+#
+# Extracting text with pdfplumber dominates a parse run, so the page text of a
+# folder of PDFs is extracted once and stored in a single file:
+#
+#   header   magic, version, codec, offset and length of the index
+#   frames   compressed page texts, then compressed blocks of entry texts
+#   index    JSON: per document, (offset, length) of every page frame and
+#            entry block, i.e. one "pages" and one "entries" column
+#
+# The file is memory-mapped and frames are decompressed on demand, so any page
+# or entry can be read without touching the rest of the corpus.
+#
+#   python corpus.py build "C:\Users\haoyu\Downloads\auctionfiles" auctions.corpus
+#   python corpus.py replay auctions.corpus
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+MAGIC = b"AUCTXT01"
+VERSION = 1
+# magic, version, codec name, index offset, index length
+HEADER = struct.Struct("<8sH6sQQ")
+# Entries are compressed in blocks; reading one entry decompresses one block
+ENTRY_BLOCK_SIZE = 64
+ENTRY_SEPARATOR = "\x00"
+ZSTD_LEVEL = 9
+ZLIB_LEVEL = 6
+
+
+def _compressor(codec: str):
+    if codec == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress
+    return lambda data: zlib.compress(data, ZLIB_LEVEL)
+
+
+def _decompressor(codec: str):
+    if codec == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("This corpus is zstd-compressed; install the zstandard package to read it")
+        return zstandard.ZstdDecompressor().decompress
+    return zlib.decompress
+
+
+def default_codec() -> str:
+    """zstd when the zstandard package is installed, otherwise zlib from the standard library."""
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return "zlib"
+    return "zstd"
+
+
+def write_corpus(path: str, documents: Iterable[Tuple[str, List[str]]], codec: Optional[str] = None) -> Dict[str, int]:
+    """
+    Write documents' page texts, and the entries cut from them, to a corpus file.
+
+    Args:
+        path: Corpus file to write (replaced atomically)
+        documents: (document name, page texts) pairs; empty pages are ""
+        codec: "zstd" or "zlib" (default: zstd if available)
+
+    Returns:
+        dict: Document, page and entry counts and the raw and stored sizes
+    """
+    from pages import clean_pages, iter_entries
+
+    codec = codec or default_codec()
+    compress = _compressor(codec)
+    stats = {"documents": 0, "pages": 0, "entries": 0, "raw_bytes": 0, "stored_bytes": 0}
+    index: Dict[str, Any] = {"entry_block_size": ENTRY_BLOCK_SIZE, "documents": []}
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, codec.encode("ascii"), 0, 0))
+
+        def frame(text: str) -> List[int]:
+            if not text:
+                return [0, 0]
+            raw = text.encode("utf-8")
+            data = compress(raw)
+            offset = file.tell()
+            file.write(data)
+            stats["raw_bytes"] += len(raw)
+            stats["stored_bytes"] += len(data)
+            return [offset, len(data)]
+
+        for name, page_texts in documents:
+            document = {"name": name, "pages": [frame(text or "") for text in page_texts],
+                        "entries": 0, "entry_blocks": []}
+            block: List[str] = []
+            for entry in iter_entries(clean_pages(page_texts)):
+                block.append(entry.replace(ENTRY_SEPARATOR, ""))
+                document["entries"] += 1
+                if len(block) == ENTRY_BLOCK_SIZE:
+                    document["entry_blocks"].append(frame(ENTRY_SEPARATOR.join(block)))
+                    block = []
+            if block:
+                document["entry_blocks"].append(frame(ENTRY_SEPARATOR.join(block)))
+            index["documents"].append(document)
+            stats["documents"] += 1
+            stats["pages"] += len(page_texts)
+            stats["entries"] += document["entries"]
+
+        index_offset = file.tell()
+        index_data = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        file.write(index_data)
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, codec.encode("ascii"), index_offset, len(index_data)))
+    os.replace(tmp_path, path)
+    return stats
+
+
+def build_corpus(folder_path: str, path: str, codec: Optional[str] = None) -> Dict[str, int]:
+    """Extract the text of every PDF in a folder once and store it as a corpus."""
+    from dc4 import extract_pages
+
+    pdf_files = sorted(f for f in os.listdir(folder_path) if f.lower().endswith(".pdf"))
+    if not pdf_files:
+        raise ValueError(f"No PDF files found in {folder_path}")
+
+    def documents() -> Iterator[Tuple[str, List[str]]]:
+        for pdf_file in pdf_files:
+            print(f"Extracting {pdf_file}...")
+            page_texts, _ = extract_pages(os.path.join(folder_path, pdf_file))
+            yield pdf_file, page_texts
+
+    return write_corpus(path, documents(), codec)
+
+
+class Corpus:
+    """
+    Read-only, memory-mapped view of a corpus file.
+
+    Documents are addressed by name or position; pages and entries by position.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ValueError(f"Not a corpus file: {path}")
+        magic, version, codec, index_offset, index_length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a corpus file: {path}")
+        self.codec = codec.rstrip(b"\0").decode("ascii")
+        try:
+            self._decompress = _decompressor(self.codec)
+        except ImportError:
+            self.close()
+            raise
+        index = json.loads(self._map[index_offset:index_offset + index_length])
+        self.entry_block_size = index["entry_block_size"]
+        self._documents = index["documents"]
+        self._positions = {document["name"]: position for position, document in enumerate(self._documents)}
+
+    def __enter__(self) -> "Corpus":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    @property
+    def documents(self) -> List[str]:
+        return [document["name"] for document in self._documents]
+
+    def _document(self, document) -> Dict[str, Any]:
+        if isinstance(document, str):
+            if document not in self._positions:
+                raise KeyError(f"No document {document!r} in {self.path}")
+            document = self._positions[document]
+        return self._documents[document]
+
+    def _read(self, offset: int, length: int) -> str:
+        if not length:
+            return ""
+        return self._decompress(self._map[offset:offset + length]).decode("utf-8")
+
+    def page_count(self, document) -> int:
+        return len(self._document(document)["pages"])
+
+    def page(self, document, number: int) -> str:
+        """Text of one page (0-based); "" for a page without a text layer."""
+        return self._read(*self._document(document)["pages"][number])
+
+    def pages(self, document) -> List[str]:
+        return [self._read(offset, length) for offset, length in self._document(document)["pages"]]
+
+    def entry_count(self, document) -> int:
+        return self._document(document)["entries"]
+
+    def entry(self, document, number: int) -> str:
+        """Text of one entry (0-based), as cut by pages.iter_entries."""
+        info = self._document(document)
+        if not 0 <= number < info["entries"]:
+            raise IndexError(f"Entry {number} out of range")
+        block_number, position = divmod(number, self.entry_block_size)
+        block = self._read(*info["entry_blocks"][block_number])
+        return block.split(ENTRY_SEPARATOR)[position]
+
+    def entries(self, document) -> Iterator[str]:
+        for offset, length in self._document(document)["entry_blocks"]:
+            yield from self._read(offset, length).split(ENTRY_SEPARATOR)
+
+
+def replay(path: str, from_pages: bool = False) -> Dict[str, Any]:
+    """
+    Re-parse every document of a corpus.
+
+    Args:
+        path: Corpus file
+        from_pages: Re-run page cleaning and entry splitting on the stored
+            pages instead of parsing the stored entries
+
+    Returns:
+        dict: Records per document, plus entry count and time spent reading vs parsing
+    """
+    from dc4 import parse_entries
+    from pages import clean_pages, iter_entries
+
+    records: Dict[str, List[Dict[str, Any]]] = {}
+    read_seconds = parse_seconds = 0.0
+    entry_count = 0
+    with Corpus(path) as corpus:
+        for name in corpus.documents:
+            start = time.perf_counter()
+            if from_pages:
+                entries = list(iter_entries(clean_pages(corpus.pages(name))))
+            else:
+                entries = list(corpus.entries(name))
+            read_seconds += time.perf_counter() - start
+
+            start = time.perf_counter()
+            records[name] = parse_entries(entries)
+            parse_seconds += time.perf_counter() - start
+            entry_count += len(entries)
+    return {"records": records, "entries": entry_count,
+            "read_seconds": read_seconds, "parse_seconds": parse_seconds}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build or replay an extracted-text corpus.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Extract a folder of PDFs into a corpus")
+    build.add_argument("folder", help="Folder of Artnet PDF exports")
+    build.add_argument("corpus", help="Corpus file to write")
+    build.add_argument("--codec", choices=["zstd", "zlib"], help="Compression (default: zstd if installed)")
+    run = commands.add_parser("replay", help="Parse every entry of a corpus")
+    run.add_argument("corpus", help="Corpus file to read")
+    run.add_argument("--from-pages", action="store_true", help="Re-split entries from the stored pages")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        stats = build_corpus(args.folder, args.corpus, args.codec)
+        print(
+            f"Stored {stats['documents']} documents, {stats['pages']} pages and {stats['entries']} entries: "
+            f"{stats['raw_bytes'] / 1024:.0f} KB of text in {stats['stored_bytes'] / 1024:.0f} KB"
+        )
+    else:
+        result = replay(args.corpus, args.from_pages)
+        records = sum(len(document) for document in result["records"].values())
+        total = result["read_seconds"] + result["parse_seconds"]
+        print(
+            f"Parsed {result['entries']} entries into {records} records in {total:.2f}s "
+            f"({result['entries'] / max(total, 1e-9):,.0f} entries/s; "
+            f"reading {result['read_seconds']:.2f}s, parsing {result['parse_seconds']:.2f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,23 @@
 import os
-import pandas as pd
-import PyPDF2
 import re
-from typing import Optional, List, Dict, Any
+from itertools import islice
+from typing import Optional, Iterable, List, Dict, Any, Tuple
 
 #64+68+96+100+100+45+40+84
 
-import pdfplumber  # Changed from PyPDF2 to pdfplumber
+# Only re-based modules are imported here so the parser stays cheap to import.
+# pdfplumber, pandas and the OCR pool are imported on the paths that use them.
+from dimensions import parse_dimensions
+from pages import clean_pages, iter_entries
+from quality import QualityReport, score_record
+from schema import compile_plan
+
+
+# Field schema compiled once; see schema.ARTNET_FIELDS
+PLAN = compile_plan()
+
+# Entries are parsed in batches so that streamed documents never need to be held whole
+ENTRY_BATCH_SIZE = 500
 
 
 def parse_auction_data(text: str) -> List[Dict[str, Any]]:
@@ -14,121 +25,37 @@ def parse_auction_data(text: str) -> List[Dict[str, Any]]:
     if not isinstance(text, str) or not text.strip():
         return []
         
-    auctions = []
     # Split by numbered entries, but avoid splitting on auction lot numbers
     entries = re.split(r'\n(?=\d+\s+(?!Fine\s+Art|Contemporary|Modern)[A-Za-z\s]+\n)', text)
+    return parse_entries(entries)
+
+def parse_entries(entries: Iterable[str]) -> List[Dict[str, Any]]:
+    """Parse already separated lot entries, e.g. from pages.iter_entries."""
+    auctions = []
+    entries = iter(entries)
+    while True:
+        batch = list(islice(entries, ENTRY_BATCH_SIZE))
+        if not batch:
+            break
+        auctions.extend(_parse_batch(batch))
+    return auctions
+
+def _parse_batch(entries: List[str]) -> List[Dict[str, Any]]:
+    """Parse one batch of entries; sizes are parsed for the whole batch at once."""
+    auctions = []
+    sizes = parse_dimensions(entries)
     
-    for entry in entries:
+    for index, entry in enumerate(entries):
         if not entry.strip():
             continue
             
         try:
-            auction_data = {}
-            
-            # Artist extraction - now matches the number prefix format
-            artist_pattern = r'^\d+\s+([A-Za-z\s]+)'
-            artist_match = re.search(artist_pattern, entry.strip())
-            if artist_match:
-                auction_data["Artist"] = clean_text(artist_match)
-            
-            # Title extraction - matches after "Title" label
-            title_pattern = r'Title\s+(.*?)(?=\s+Description|Medium|$)'
-            title_match = re.search(title_pattern, entry, re.DOTALL)
-            auction_data["Title"] = clean_text(title_match)
-            
-            # Description extraction to help with material parsing
-            desc_pattern = r'Description\s+(.*?)(?=\s+Medium|$)'
-            desc_match = re.search(desc_pattern, entry, re.DOTALL)
-            desc_text = clean_text(desc_match) if desc_match else ""
-            
-            # Medium extraction with fallback to description
-            medium_pattern = r'Medium\s+(.*?)(?=\s+Year|Size|$)'
-            medium_match = re.search(medium_pattern, entry, re.DOTALL)
-            if medium_match:
-                auction_data["Medium"] = clean_text(medium_match)
-            elif "oil on" in desc_text.lower() or "acrylic on" in desc_text.lower():
-                # Extract medium from description if not found in Medium field
-                medium_from_desc = re.search(r'((?:oil|acrylic).*?(?:canvas|paper|board|wood|panel))(?=\s|,|$)', desc_text.lower())
-                if medium_from_desc:
-                    auction_data["Medium"] = medium_from_desc.group(1)
-            
-            # Year extraction
-            year_patterns = [
-                r'Year of Work\s*(\d{4})',
-                r'dated\s*[\'"]?(\d{4})',
-                r'signed.*?dated.*?(\d{4})',
-                r'created in\s*(\d{4})',
-                r',\s*(\d{4})(?=\s|$)'
-            ]
-            for pattern in year_patterns:
-                year_match = re.search(pattern, entry, re.IGNORECASE)
-                if year_match:
-                    auction_data["Year"] = clean_text(year_match)
-                    break
-            
-            # Size extraction with support for 3D works
-            size_patterns = [
-                # Pattern for 3D works
-                r'Size\s+Height\s+(\d+\.?\d*)\s*in\.?\s*;\s*Width\s+(\d+\.?\d*)\s*in\.?(?:\s*;\s*Depth\s+(\d+\.?\d*)\s*in\.?)?\s*\/\s*Height\s+(\d+\.?\d*)\s*cm\.?\s*;\s*Width\s+(\d+\.?\d*)\s*cm\.?(?:\s*;\s*Depth\s+(\d+\.?\d*)\s*cm\.?)?',
-                # Pattern for 2D works
-                r'Size\s+Height\s+(\d+\.?\d*)\s*in\.?\s*;\s*Width\s+(\d+\.?\d*)\s*in\.?\s*\/\s*Height\s+(\d+\.?\d*)\s*cm\.?\s*;\s*Width\s+(\d+\.?\d*)\s*cm',
-                # Alternative format
-                r'Height\s+(\d+\.?\d*)\s*in\.?\s*[;.]\s*Width\s+(\d+\.?\d*)\s*in\.?(?:\s*[;.]\s*Depth\s+(\d+\.?\d*)\s*in\.?)?'
-            ]
-            
-            for pattern in size_patterns:
-                size_match = re.search(pattern, entry, re.DOTALL | re.IGNORECASE)
-                if size_match:
-                    groups = size_match.groups()
-                    auction_data["Height (in)"] = clean_text(size_match, 1)
-                    auction_data["Width (in)"] = clean_text(size_match, 2)
-                    if len(groups) > 2 and groups[2]:  # Depth information exists
-                        auction_data["Depth (in)"] = clean_text(size_match, 3)
-                    if len(groups) > 3:  # CM measurements exist
-                        start_idx = 4 if len(groups) > 5 else 3  # Adjust index based on pattern
-                        auction_data["Height (cm)"] = clean_text(size_match, start_idx)
-                        auction_data["Width (cm)"] = clean_text(size_match, start_idx + 1)
-                        if len(groups) > 5 and groups[5]:  # CM depth exists
-                            auction_data["Depth (cm)"] = clean_text(size_match, 6)
-                    break
-            
-            # Misc field extraction
-            misc_pattern = r'Misc\.\s+([^S][^a][^l][^e].*?)(?=Sale|$)'
-            misc_match = re.search(misc_pattern, entry, re.DOTALL)
-            if misc_match:
-                auction_data["Misc"] = clean_text(misc_match)
-
-            # Sale information with improved lot number and auction name handling
-            sale_pattern = r'Sale of\s+(.*?)\s*\[Lot\s*(\d+\s*[A-Z]?)\]\s*(.*?)(?=Estimate|$)'
-            sale_match = re.search(sale_pattern, entry, re.DOTALL)
-            if sale_match:
-                sale_text = clean_text(sale_match, 1)
-                # Split auction house and date if possible
-                parts = sale_text.split(':', 1)
-                if len(parts) > 1:
-                    auction_data["Auction House"] = parts[0].strip()
-                    auction_data["Sale Date"] = parts[1].strip()
-                else:
-                    auction_data["Auction House"] = sale_text
-                auction_data["Lot Number"] = clean_text(sale_match, 2)
-                auction_data["Auction Name"] = clean_text(sale_match, 3)
-            
-            # Estimate with improved currency handling
-            estimate_pattern = r'Estimate\s*((?:\d{1,3}(?:,\d{3})*(?:\.\d+)?|\d+)\s*(?:-|to)\s*(?:\d{1,3}(?:,\d{3})*(?:\.\d+)?|\d+)\s*(?:USD|GBP|HKD|CNY|AUD|EUR|SGD)(?:\s*\(.*?\))?)'
-            estimate_match = re.search(estimate_pattern, entry)
-            auction_data["Estimate Price"] = clean_text(estimate_match) if estimate_match else ""
-            
-            # Sold price with improved handling
-            sold_price_pattern = r'Sold For\s*((?:[\d,]+\s*[A-Z]{3})|(?:Bought In)|(?:Withdrawn)|(?:Passed)|(?:Not Sold))(?:\s*(?:Premium|Hammer))?(?:\s*\(([\d,]+\s*USD)\))?'
-            sold_match = re.search(sold_price_pattern, entry)
-            if sold_match:
-                price = clean_text(sold_match, 1)
-                usd_price = clean_text(sold_match, 2) if sold_match.group(2) else ""
-                auction_data["Sold Price"] = f"{price} ({usd_price})" if usd_price else price
+            auction_data = PLAN.extract(entry, {"Size": sizes[index]})
             
             # Only add entry if we have both artist and title (or one with substantial other data)
             if (auction_data.get("Artist") or auction_data.get("Title")) and len(auction_data) > 3:
-                auctions.append(auction_data)
+                # Scored here so that checking quality costs no extra pass
+                auctions.append(score_record(auction_data))
                 
         except Exception as e:
             print(f"Error parsing entry: {str(e)}")
@@ -137,70 +64,176 @@ def parse_auction_data(text: str) -> List[Dict[str, Any]]:
             
     return auctions
 
-def clean_text(match: Optional[re.Match], group: int = 1) -> str:
+def extract_pages(pdf_path: str) -> Tuple[List[str], List[int]]:
     """
-    Clean matched text by removing excess whitespace.
+    Extract the text of every page of a PDF.
     
     Args:
-        match: Regex match object
-        group: Group number to extract from match
+        pdf_path: Path to the PDF file, or a binary file object
         
     Returns:
-        str: Cleaned text or empty string if no match
+        tuple: Text per page, and the 1-based numbers of pages without a text layer
     """
-    if match and match.group(group):
-        return re.sub(r'\s+', ' ', match.group(group).strip())
-    return ""
+    import pdfplumber
+    
+    page_texts = []
+    empty_pages = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_num, page in enumerate(pdf.pages, 1):
+            try:
+                extracted_text = page.extract_text()
+            except Exception as e:
+                print(f"Error extracting text from page {page_num}: {str(e)}")
+                extracted_text = ""
+            finally:
+                # Drop the page's cached layout objects as soon as its text is out
+                page.close()
+            if not extracted_text or not extracted_text.strip():
+                empty_pages.append(page_num)
+                extracted_text = ""
+            page_texts.append(extracted_text)
+    return page_texts, empty_pages
 
-def process_folder(folder_path: str, output_csv: str) -> None:
-    """Process all PDF files in a folder and combine results into a single CSV."""
+def process_folder(folder_path: str, output_csv: Optional[str], ocr: bool = False,
+                   ocr_workers: Optional[int] = None, partition_dir: Optional[str] = None,
+                   partition_format: str = "csv", repeat_sales_csv: Optional[str] = None,
+                   checkpoint_dir: Optional[str] = None, quality_report_csv: Optional[str] = None) -> None:
+    """
+    Process all PDF files in a folder and combine results into a single CSV.
+    
+    Args:
+        folder_path: Folder containing the Artnet PDF exports
+        output_csv: Path of the combined CSV, or None to only write partitions
+        ocr: Run local OCR on pages that have no text layer
+        ocr_workers: Size of the OCR process pool (default ocr.MAX_WORKERS)
+        partition_dir: Also write an artist=/year= partitioned dataset here
+        partition_format: "csv" or "parquet" for the partitioned dataset
+        repeat_sales_csv: Also write the repeat-sale pairs found across all files here
+        checkpoint_dir: Commit each file's records here so an interrupted run
+            started again with the same arguments resumes where it stopped
+        quality_report_csv: Also write per-file and per-field coverage and
+            quality check failures here (see quality.QualityReport)
+    """
     if not os.path.exists(folder_path):
         raise FileNotFoundError(f"Folder not found: {folder_path}")
     
-    pdf_files = [f for f in os.listdir(folder_path) if f.lower().endswith('.pdf')]
+    # Sorted so that output order doesn't depend on the directory listing
+    pdf_files = sorted(f for f in os.listdir(folder_path) if f.lower().endswith('.pdf'))
     if not pdf_files:
         raise ValueError(f"No PDF files found in {folder_path}")
     
+    ocr_pool = None
+    if ocr:
+        from ocr import MAX_WORKERS, OcrPool, ocr_available
+        
+        if ocr_available():
+            ocr_pool = OcrPool(max_workers=ocr_workers or MAX_WORKERS)
+        else:
+            print("Warning: OCR requested but pytesseract/tesseract is not installed; skipping OCR")
+    
+    checkpoint = None
+    if checkpoint_dir:
+        from checkpoint import Checkpoint, run_fingerprint
+        
+        checkpoint = Checkpoint(checkpoint_dir, run_fingerprint(
+            folder_path, ocr=ocr_pool is not None,
+        )).open()
+    
+    report = None
+    if quality_report_csv:
+        report = QualityReport()
+    
     all_auctions = []
-    for pdf_file in pdf_files:
-        pdf_path = os.path.join(folder_path, pdf_file)
-        try:
-            print(f"\nProcessing {pdf_file}...")
-            
-            # Read PDF with pdfplumber
-            with pdfplumber.open(pdf_path) as pdf:
-                text = ""
-                for page_num, page in enumerate(pdf.pages, 1):
-                    try:
-                        extracted_text = page.extract_text()
-                        if extracted_text:
-                            text += extracted_text + "\n"
-                    except Exception as e:
-                        print(f"Error extracting text from page {page_num}: {str(e)}")
-            
-            # Print sample of extracted text for debugging
-            print(f"Sample of extracted text:\n{text[:500]}...\n")
-            
-            auctions = parse_auction_data(text)
-            if auctions:
-                all_auctions.extend(auctions)
-                print(f"Successfully extracted {len(auctions)} records from {pdf_file}")
+    try:
+        for pdf_file in pdf_files:
+            pdf_path = os.path.join(folder_path, pdf_file)
+            if checkpoint is not None and checkpoint.is_done(pdf_path):
+                print(f"Skipping {pdf_file}: already in checkpoint")
+                if report is not None:
+                    report.add(pdf_file, checkpoint.iter_records([pdf_path]))
+                continue
+            auctions = _process_file(pdf_path, ocr_pool)
+            if auctions is None:
+                # Dropped from the checkpoint, so its old records are not output and a resumed run retries it
+                if checkpoint is not None:
+                    checkpoint.discard(pdf_path)
+                continue
+            if report is not None:
+                report.add(pdf_file, auctions)
+            if checkpoint is not None:
+                checkpoint.record(pdf_path, auctions)
             else:
-                print(f"No auction data found in {pdf_file}")
-        except Exception as e:
-            print(f"Error processing {pdf_file}: {str(e)}")
+                all_auctions.extend(auctions)
+        if checkpoint is not None:
+            # Parts are read back in file order, so a resumed run matches an uninterrupted one
+            all_auctions = list(checkpoint.iter_records(
+                os.path.join(folder_path, pdf_file) for pdf_file in pdf_files
+            ))
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+        if ocr_pool is not None:
+            ocr_pool.close()
+            print(ocr_pool.summary())
     
     if not all_auctions:
         print("Warning: No auction data extracted from any files")
         return
         
-    df = pd.DataFrame(all_auctions)
-    df.to_csv(output_csv, index=False)
-    print(f"\nData saved to {output_csv}")
+    if output_csv:
+        import pandas as pd
+        
+        df = pd.DataFrame(all_auctions)
+        df.to_csv(output_csv, index=False)
+        print(f"\nData saved to {output_csv}")
+    if partition_dir:
+        from partition import write_partitioned
+        
+        write_partitioned(all_auctions, partition_dir, partition_format)
+    if repeat_sales_csv:
+        from repeat_sales import write_repeat_sales
+        
+        write_repeat_sales(all_auctions, repeat_sales_csv)
+    if report is not None:
+        report.write_csv(quality_report_csv)
+        print(f"\n{report.format()}\nQuality report saved to {quality_report_csv}")
     print(f"Total records extracted: {len(all_auctions)}")
 
+def _process_file(pdf_path: str, ocr_pool=None) -> Optional[List[Dict[str, Any]]]:
+    """Extract and parse one PDF; returns its records, or None if it failed."""
+    pdf_file = os.path.basename(pdf_path)
+    try:
+        print(f"\nProcessing {pdf_file}...")
+        
+        page_texts, empty_pages = extract_pages(pdf_path)
+        
+        # Image-only pages go through OCR, if enabled
+        if ocr_pool is not None and empty_pages:
+            print(f"Running OCR on {len(empty_pages)} image-only pages")
+            for page_num, ocr_text in ocr_pool.ocr_pages(pdf_path, empty_pages).items():
+                page_texts[page_num - 1] = ocr_text
+        elif empty_pages:
+            print(f"Skipped {len(empty_pages)} pages without a text layer")
+        
+        # Print sample of extracted text for debugging
+        sample = next((page_text for page_text in page_texts if page_text), "")
+        print(f"Sample of extracted text:\n{sample[:500]}...\n")
+        
+        # Strip page headers/footers and stitch entries across page breaks
+        auctions = parse_entries(iter_entries(clean_pages(page_texts)))
+        if auctions:
+            print(f"Successfully extracted {len(auctions)} records from {pdf_file}")
+        else:
+            print(f"No auction data found in {pdf_file}")
+        return auctions
+    except Exception as e:
+        print(f"Error processing {pdf_file}: {str(e)}")
+        return None
+
 def extract_text_from_pdf(pdf_path: str) -> str:
     """Extract and preprocess text from PDF with improved encoding support."""
+    import pdfplumber
+    
     text = ""
     with pdfplumber.open(pdf_path) as pdf:
         for page in pdf.pages:
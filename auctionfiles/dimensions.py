@@ -0,0 +1,148 @@
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+CM_PER_INCH = 2.54
+
+# Artnet rounds both units to one decimal, so allow a small absolute slack
+# for small works and a relative one for large works.
+ABS_TOLERANCE_CM = 0.5
+REL_TOLERANCE = 0.03
+
+# A depth at least this fraction of the smallest face makes an object 3D;
+# stretcher bars and panels stay well below it.
+DEPTH_RATIO_3D = 0.2
+
+SCULPTURE_KEYWORDS = (
+    "sculpture", "bronze", "marble", "ceramic", "porcelain", "stoneware",
+    "earthenware", "terracotta", "resin", "fiberglass", "fibreglass",
+    "glazed", "installation", "found object", "cast ", "carved",
+)
+
+AXES = ("Height", "Width", "Depth")
+
+# Compiled once at import; every entry goes through the same objects
+_SIZE_BLOCK_RE = re.compile(
+    r'Size\s+(.*?)(?=\n(?:Misc\.|(?:Sale of|Estimate|Sold For)\b)|\Z)',
+    re.DOTALL,
+)
+_DIMENSION_RE = re.compile(
+    r'\b(Height|Width|Depth|Length|Diameter)\s+(\d+(?:\.\d+)?)\s*(in|cm)\b\.?',
+    re.IGNORECASE,
+)
+_MEDIUM_RE = re.compile(r'^Medium\s+(.*)$', re.MULTILINE)
+# "... on canvas", "... on wooden panel": a flat support wins over materials
+_FLAT_SUPPORT_RE = re.compile(
+    r'\bon\s+(?:\w+\s+)?(?:canvas|linen|paper|board|panel|masonite|card)',
+    re.IGNORECASE,
+)
+
+_AXIS_ALIASES = {
+    "height": "Height",
+    "width": "Width",
+    "diameter": "Width",
+    "depth": "Depth",
+    "length": "Depth",
+}
+
+
+def _units_agree(inches: float, cm: float) -> bool:
+    """Check that an inch and a centimetre value describe the same length."""
+    expected = inches * CM_PER_INCH
+    return abs(expected - cm) <= max(ABS_TOLERANCE_CM, REL_TOLERANCE * cm)
+
+
+def _scan(text: str) -> Dict[str, Dict[str, float]]:
+    """Collect the first value seen for each axis and unit."""
+    found: Dict[str, Dict[str, float]] = {"in": {}, "cm": {}}
+    for label, value, unit in _DIMENSION_RE.findall(text):
+        axis = _AXIS_ALIASES[label.lower()]
+        found[unit.lower()].setdefault(axis, float(value))
+    return found
+
+
+def is_sculptural(medium: str) -> bool:
+    """Return True when the medium names a three-dimensional material."""
+    if _FLAT_SUPPORT_RE.search(medium):
+        return False
+    medium = f"{medium.lower()} "
+    return any(keyword in medium for keyword in SCULPTURE_KEYWORDS)
+
+
+def classify_work(height_cm: Optional[float], width_cm: Optional[float],
+                  depth_cm: Optional[float], medium: str = "") -> str:
+    """
+    Classify a work as 2D or 3D.
+
+    Args:
+        height_cm: Height in centimetres
+        width_cm: Width in centimetres
+        depth_cm: Depth in centimetres, if one was recorded
+        medium: Medium text used to catch sculptures without a depth
+
+    Returns:
+        str: "3D" or "2D"
+    """
+    if medium and is_sculptural(medium):
+        return "3D"
+    if depth_cm:
+        faces = [v for v in (height_cm, width_cm) if v]
+        if not faces or depth_cm >= DEPTH_RATIO_3D * min(faces):
+            return "3D"
+    return "2D"
+
+
+def parse_dimension(entry: str) -> Dict[str, Any]:
+    """
+    Parse the size block of a single lot entry.
+
+    Both units are filled in for every axis found: a missing unit is derived
+    from the other one, and when both are present they are cross-checked.
+
+    Args:
+        entry: Raw text of one lot
+
+    Returns:
+        dict: Numeric size columns, empty if the entry has no dimensions
+    """
+    block = _SIZE_BLOCK_RE.search(entry)
+    found = _scan(block.group(1) if block else entry)
+    if not found["in"] and not found["cm"]:
+        return {}
+
+    result: Dict[str, Any] = {}
+    check = "ok"
+    for axis in AXES:
+        inches = found["in"].get(axis)
+        cm = found["cm"].get(axis)
+        if inches is None and cm is None:
+            continue
+        if inches is None:
+            inches = round(cm / CM_PER_INCH, 1)
+            check = "derived" if check == "ok" else check
+        elif cm is None:
+            cm = round(inches * CM_PER_INCH, 1)
+            check = "derived" if check == "ok" else check
+        elif not _units_agree(inches, cm):
+            check = "mismatch"
+        result[f"{axis} (in)"] = inches
+        result[f"{axis} (cm)"] = cm
+
+    height = result.get("Height (cm)")
+    width = result.get("Width (cm)")
+    depth = result.get("Depth (cm)")
+    medium_match = _MEDIUM_RE.search(entry)
+    medium = medium_match.group(1) if medium_match else ""
+    kind = classify_work(height, width, depth, medium)
+
+    result["Dimensionality"] = kind
+    if height and width:
+        result["Area (sq cm)"] = round(height * width, 1)
+        if kind == "3D" and depth:
+            result["Volume (cu cm)"] = round(height * width * depth, 1)
+    result["Size Check"] = check
+    return result
+
+
+def parse_dimensions(entries: Sequence[str]) -> List[Dict[str, Any]]:
+    """Parse the dimensions of many entries at once, preserving order."""
+    return [parse_dimension(entry) for entry in entries]
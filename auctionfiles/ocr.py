@@ -0,0 +1,151 @@
+import hashlib
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Optional, Tuple
+
+# OCR is optional: it needs pytesseract and a local tesseract binary.
+# Nothing leaves the machine.
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ocr_cache")
+DEFAULT_RESOLUTION = 300
+DEFAULT_LANG = "eng"
+MAX_WORKERS = max(1, min(4, (os.cpu_count() or 1) - 1))
+
+
+def ocr_available() -> bool:
+    """Return True when pytesseract and the tesseract binary are installed."""
+    try:
+        import pytesseract  # noqa: F401
+    except ImportError:
+        return False
+    return shutil.which("tesseract") is not None
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 of a file, used to key the page cache."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _ocr_page(pdf_path: str, page_number: int, resolution: int, lang: str) -> Tuple[str, float]:
+    """Render one page and run tesseract on it. Runs in a worker process."""
+    import pdfplumber
+    import pytesseract
+
+    start = time.perf_counter()
+    with pdfplumber.open(pdf_path) as pdf:
+        page = pdf.pages[page_number - 1]
+        image = page.to_image(resolution=resolution).original
+        text = pytesseract.image_to_string(image, lang=lang)
+    return text, time.perf_counter() - start
+
+
+class OcrPool:
+    """
+    Bounded process pool for OCR with a per-page result cache on disk.
+
+    Pages are keyed by file content, page number, resolution and language,
+    so a page is never recognised twice, even across runs.
+
+    Usage:
+        with OcrPool() as pool:
+            texts = pool.ocr_pages(pdf_path, [3, 7])
+        print(pool.summary())
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS, cache_dir: str = DEFAULT_CACHE_DIR,
+                 resolution: int = DEFAULT_RESOLUTION, lang: str = DEFAULT_LANG):
+        self.max_workers = max(1, max_workers)
+        self.cache_dir = cache_dir
+        self.resolution = resolution
+        self.lang = lang
+        self.stats = {"pages": 0, "cached": 0, "failed": 0, "page_seconds": 0.0, "wall_seconds": 0.0}
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "OcrPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _cache_path(self, digest: str, page_number: int) -> str:
+        name = f"{digest}-p{page_number}-r{self.resolution}-{self.lang}.txt"
+        return os.path.join(self.cache_dir, name)
+
+    def _store(self, path: str, text: str) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(tmp_path, path)
+
+    def ocr_pages(self, pdf_path: str, page_numbers: Iterable[int]) -> Dict[int, str]:
+        """
+        OCR the given pages of a PDF.
+
+        Args:
+            pdf_path: Path to the PDF file
+            page_numbers: 1-based page numbers whose text layer was empty
+
+        Returns:
+            dict: Page number to recognised text
+        """
+        page_numbers = list(page_numbers)
+        if not page_numbers:
+            return {}
+
+        digest = file_digest(pdf_path)
+        results: Dict[int, str] = {}
+        pending = []
+        for page_number in page_numbers:
+            path = self._cache_path(digest, page_number)
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as file:
+                    results[page_number] = file.read()
+                self.stats["cached"] += 1
+            else:
+                pending.append(page_number)
+
+        if not pending:
+            return results
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        start = time.perf_counter()
+        futures = {
+            self._executor.submit(_ocr_page, pdf_path, page_number, self.resolution, self.lang): page_number
+            for page_number in pending
+        }
+        for future in as_completed(futures):
+            page_number = futures[future]
+            try:
+                text, page_seconds = future.result()
+            except Exception as e:
+                print(f"Error running OCR on page {page_number} of {pdf_path}: {str(e)}")
+                self.stats["failed"] += 1
+                continue
+            self._store(self._cache_path(digest, page_number), text)
+            results[page_number] = text
+            self.stats["pages"] += 1
+            self.stats["page_seconds"] += page_seconds
+        self.stats["wall_seconds"] += time.perf_counter() - start
+        return results
+
+    def summary(self) -> str:
+        """Describe how many pages went through OCR and what they cost."""
+        stats = self.stats
+        return (
+            f"OCR: {stats['pages']} pages recognised, {stats['cached']} from cache, "
+            f"{stats['failed']} failed; {stats['page_seconds']:.1f}s of page time, "
+            f"{stats['wall_seconds']:.1f}s wall"
+        )
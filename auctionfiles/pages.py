@@ -0,0 +1,121 @@
+import re
+from itertools import islice
+from typing import Iterable, Iterator, List, Sequence, Set
+
+# Only the first and last few lines of a page can be header or footer
+HEADER_LINES = 3
+FOOTER_LINES = 3
+
+# Pages read before deciding what the boilerplate of a document is
+SAMPLE_PAGES = 20
+
+# A line shape must repeat on at least this share of sampled pages
+MIN_SHARE = 0.6
+
+# Line that starts a new lot, e.g. "12 Avery Singer"
+ENTRY_START_RE = re.compile(r'^\d+\s+(?!Fine\s+Art|Contemporary|Modern)[A-Za-z ]+$')
+
+# Lines that carry lot content and must never be learned as boilerplate
+FIELD_LABEL_RE = re.compile(
+    r'^(?:Misc\.|(?:Title|Description|Medium|Year of Work|Size|Sale of|Estimate|Sold For)\b)'
+)
+
+_DIGITS_RE = re.compile(r'\d+')
+
+
+def line_signature(line: str) -> str:
+    """Reduce a line to its shape so that page numbers and timestamps compare equal."""
+    return _DIGITS_RE.sub('#', line.strip())
+
+
+def _is_content(line: str) -> bool:
+    """Return True for entry starts and labelled field lines."""
+    return bool(ENTRY_START_RE.match(line) or FIELD_LABEL_RE.match(line))
+
+
+def _edge_lines(lines: Sequence[str]) -> List[str]:
+    """Return the lines that may hold a header or footer."""
+    if len(lines) <= HEADER_LINES + FOOTER_LINES:
+        return list(lines)
+    return list(lines[:HEADER_LINES]) + list(lines[-FOOTER_LINES:])
+
+
+def learn_boilerplate(pages: Sequence[str]) -> Set[str]:
+    """
+    Learn the header and footer lines that repeat across the pages of a document.
+
+    Args:
+        pages: Text of each page
+
+    Returns:
+        set: Signatures of lines to strip (see line_signature)
+    """
+    pages = [page for page in pages if page and page.strip()]
+    if len(pages) < 2:
+        return set()
+
+    counts = {}
+    for page in pages:
+        signatures = {
+            line_signature(line) for line in _edge_lines(page.splitlines()) if not _is_content(line)
+        }
+        for signature in signatures:
+            if signature:
+                counts[signature] = counts.get(signature, 0) + 1
+
+    threshold = max(2, MIN_SHARE * len(pages))
+    return {signature for signature, count in counts.items() if count >= threshold}
+
+
+def strip_boilerplate(page: str, boilerplate: Set[str]) -> str:
+    """Remove learned header and footer lines from the edges of a page."""
+    if not boilerplate or not page:
+        return page
+    lines = page.splitlines()
+    start, end = 0, len(lines)
+    while start < min(HEADER_LINES, end) and line_signature(lines[start]) in boilerplate:
+        start += 1
+    while end > max(start, len(lines) - FOOTER_LINES) and line_signature(lines[end - 1]) in boilerplate:
+        end -= 1
+    return "\n".join(lines[start:end])
+
+
+def clean_pages(pages: Iterable[str], sample_size: int = SAMPLE_PAGES) -> Iterator[str]:
+    """
+    Strip headers and footers from a stream of pages.
+
+    The boilerplate is learned once from the first sample_size pages and then
+    applied to every page, so long documents are never held in memory whole.
+    """
+    pages = iter(pages)
+    sample = list(islice(pages, sample_size))
+    boilerplate = learn_boilerplate(sample)
+    for page in sample:
+        yield strip_boilerplate(page, boilerplate)
+    for page in pages:
+        yield strip_boilerplate(page, boilerplate)
+
+
+def iter_entries(pages: Iterable[str]) -> Iterator[str]:
+    """
+    Stitch lot entries together across page boundaries.
+
+    Pages are consumed one at a time and each entry is yielded as soon as the
+    next one starts, so an entry that straddles a page break comes out whole.
+    Text before the first entry (cover text, column headings) is dropped.
+    """
+    current: List[str] = []
+    started = False
+    for page in pages:
+        if not page:
+            continue
+        for line in page.splitlines():
+            if ENTRY_START_RE.match(line):
+                if started and current:
+                    yield "\n".join(current)
+                current = [line]
+                started = True
+            elif started:
+                current.append(line)
+    if started and current:
+        yield "\n".join(current)
@@ -0,0 +1,196 @@
+import json
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from records import sale_date, sold_usd
+
+# Hive-style partitioned output: <root>/artist=<name>/year=<sale year>/part-00000.<fmt>
+# with a _metadata.json summary next to each part file.
+
+FORMATS = ("csv", "parquet")
+PART_NAME = "part-00000"
+METADATA_NAME = "_metadata.json"
+# Hive's name for rows whose partition value is missing
+DEFAULT_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+_YEAR_RE = re.compile(r'\b(1[89]\d{2}|20\d{2})\b')
+
+
+def _sale_year(record: Dict[str, Any]) -> Optional[str]:
+    date = sale_date(record)
+    if date:
+        return str(date.year)
+    year_match = _YEAR_RE.search(record.get("Sale Date") or "")
+    return year_match.group(1) if year_match else None
+
+
+def partition_key(record: Dict[str, Any]) -> Tuple[str, str]:
+    """Return the (artist, year) partition of a record."""
+    artist = (record.get("Artist") or "").strip() or DEFAULT_PARTITION
+    year = _sale_year(record) or DEFAULT_PARTITION
+    return artist, year
+
+
+def partition_path(root: str, artist: str, year: str) -> str:
+    """Directory of one partition; values are URI-escaped as Hive does."""
+    return os.path.join(root, f"artist={quote(artist, safe=' ')}", f"year={quote(year, safe=' ')}")
+
+
+def _summarise(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    dates = [d for d in (sale_date(record) for record in records) if d]
+    prices = [p for p in (sold_usd(record) for record in records) if p is not None]
+    return {
+        "rows": len(records),
+        "min_sale_date": min(dates).date().isoformat() if dates else None,
+        "max_sale_date": max(dates).date().isoformat() if dates else None,
+        "sold_rows": len(prices),
+        "total_usd": sum(prices),
+    }
+
+
+def _atomic_write_json(path: str, data: Dict[str, Any]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _remove_partition_files(directory: str, keep: Optional[str] = None) -> None:
+    """Remove a partition's metadata and part files, except the part file named keep."""
+    metadata_path = os.path.join(directory, METADATA_NAME)
+    # Metadata first, so readers stop listing the partition before its part goes
+    if keep is None and os.path.exists(metadata_path):
+        os.remove(metadata_path)
+    for fmt in FORMATS:
+        part_name = f"{PART_NAME}.{fmt}"
+        if part_name == keep:
+            continue
+        for name in (part_name, f"{part_name}.tmp"):
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                os.remove(path)
+    if keep is None and not os.listdir(directory):
+        os.rmdir(directory)
+
+
+def _prune_stale(root: str, written: Iterable[Tuple[str, str]]) -> int:
+    """Remove partitions of earlier runs that this run did not write; return how many."""
+    current = {os.path.normpath(partition_path(root, artist, year)) for artist, year in written}
+    removed = 0
+    for artist_dir in os.listdir(root):
+        artist_path = os.path.join(root, artist_dir)
+        if not artist_dir.startswith("artist=") or not os.path.isdir(artist_path):
+            continue
+        for year_dir in os.listdir(artist_path):
+            year_path = os.path.join(artist_path, year_dir)
+            if year_dir.startswith("year=") and os.path.isdir(year_path) \
+                    and os.path.normpath(year_path) not in current:
+                _remove_partition_files(year_path)
+                removed += 1
+        if not os.listdir(artist_path):
+            os.rmdir(artist_path)
+    return removed
+
+
+def write_partitioned(records: Iterable[Dict[str, Any]], root: str, fmt: str = "csv") -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    Write records as a dataset partitioned by artist and sale year.
+
+    Each part file is written to a temporary name and renamed into place, and
+    its metadata summary is written only after it, so readers never see a
+    half-written partition. Partitions left under root by an earlier run that
+    this run has no rows for are removed, as are part files of the other
+    format, so the dataset always holds exactly the records written.
+
+    Args:
+        records: Parsed auction records
+        root: Dataset directory
+        fmt: "csv" or "parquet" (parquet needs pyarrow)
+
+    Returns:
+        dict: Metadata summary per (artist, year) partition
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported partition format: {fmt}")
+    import pandas as pd
+
+    partitions: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    columns: Dict[str, None] = {}
+    for record in records:
+        partitions.setdefault(partition_key(record), []).append(record)
+        columns.update(dict.fromkeys(record))
+
+    summaries = {}
+    for (artist, year), rows in sorted(partitions.items()):
+        directory = partition_path(root, artist, year)
+        os.makedirs(directory, exist_ok=True)
+        part_path = os.path.join(directory, f"{PART_NAME}.{fmt}")
+        tmp_path = f"{part_path}.tmp"
+
+        # Chronological within a partition; ISO dates sort as strings
+        rows.sort(key=lambda row: row.get("Sale Date ISO") or "")
+        # Same columns in every partition so the parts concatenate cleanly
+        df = pd.DataFrame(rows, columns=list(columns))
+        if fmt == "csv":
+            df.to_csv(tmp_path, index=False)
+        else:
+            df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, part_path)
+        _remove_partition_files(directory, keep=os.path.basename(part_path))
+
+        summary = {"artist": artist, "year": year, "file": os.path.basename(part_path)}
+        summary.update(_summarise(rows))
+        _atomic_write_json(os.path.join(directory, METADATA_NAME), summary)
+        summaries[(artist, year)] = summary
+
+    removed = _prune_stale(root, summaries)
+    print(f"Wrote {len(summaries)} partitions to {root}" + (f"; removed {removed} stale partitions" if removed else ""))
+    return summaries
+
+
+def list_partitions(root: str, artist: Optional[str] = None,
+                    years: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Return the metadata of the partitions matching an artist and/or sale years.
+
+    Only directory names and the small metadata files are read.
+    """
+    wanted_years = {str(year) for year in years} if years is not None else None
+    found = []
+    if not os.path.isdir(root):
+        return found
+    for artist_dir in sorted(os.listdir(root)):
+        if not artist_dir.startswith("artist="):
+            continue
+        if artist is not None and unquote(artist_dir[len("artist="):]) != artist:
+            continue
+        for year_dir in sorted(os.listdir(os.path.join(root, artist_dir))):
+            if not year_dir.startswith("year="):
+                continue
+            if wanted_years is not None and unquote(year_dir[len("year="):]) not in wanted_years:
+                continue
+            metadata_path = os.path.join(root, artist_dir, year_dir, METADATA_NAME)
+            if not os.path.exists(metadata_path):
+                continue  # partition still being written
+            with open(metadata_path, encoding="utf-8") as file:
+                metadata = json.load(file)
+            metadata["path"] = os.path.join(root, artist_dir, year_dir, metadata["file"])
+            found.append(metadata)
+    return found
+
+
+def read_partitions(root: str, artist: Optional[str] = None, years: Optional[Iterable[str]] = None):
+    """Load only the partitions matching an artist and/or sale years into a DataFrame."""
+    import pandas as pd
+
+    frames = []
+    for metadata in list_partitions(root, artist, years):
+        if metadata["path"].endswith(".parquet"):
+            frames.append(pd.read_parquet(metadata["path"]))
+        else:
+            frames.append(pd.read_csv(metadata["path"]))
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,119 @@
+import re
+from typing import Any, Dict, Optional
+
+# Estimate and sold-price parsing driven by a currency table.
+#
+# Artnet writes prices as "800,000 - 1,200,000 HKD" followed by an optional
+# "(102,847 - 154,271 USD)" conversion, and sold prices as "600,000 HKD
+# Premium" or "... Hammer". Every currency code below is folded into one
+# pattern that handles estimates, sold prices and lot statuses alike, so a
+# price line is matched once and its numbers come straight from the groups.
+
+# ISO 4217 codes Artnet reports prices in
+CURRENCIES = {
+    "USD": "US dollar", "GBP": "pound sterling", "EUR": "euro", "CHF": "Swiss franc",
+    "HKD": "Hong Kong dollar", "CNY": "Chinese yuan", "JPY": "Japanese yen",
+    "KRW": "South Korean won", "TWD": "New Taiwan dollar", "SGD": "Singapore dollar",
+    "INR": "Indian rupee", "IDR": "Indonesian rupiah", "MYR": "Malaysian ringgit",
+    "THB": "Thai baht", "PHP": "Philippine peso", "AUD": "Australian dollar",
+    "NZD": "New Zealand dollar", "CAD": "Canadian dollar", "BRL": "Brazilian real",
+    "MXN": "Mexican peso", "ARS": "Argentine peso", "CLP": "Chilean peso",
+    "COP": "Colombian peso", "ZAR": "South African rand", "AED": "UAE dirham",
+    "QAR": "Qatari riyal", "ILS": "Israeli shekel", "TRY": "Turkish lira",
+    "SEK": "Swedish krona", "NOK": "Norwegian krone", "DKK": "Danish krone",
+    "PLN": "Polish zloty", "CZK": "Czech koruna", "HUF": "Hungarian forint",
+    "RUB": "Russian ruble",
+}
+# Other spellings seen in exports, mapped to their ISO code
+CURRENCY_ALIASES = {"RMB": "CNY", "NTD": "TWD"}
+
+# Sold For values that are a status rather than a price
+LOT_STATUSES = ("Bought In", "Withdrawn", "Passed", "Not Sold", "Not Available")
+
+# Digits with thousands separators; a single character class keeps the match from backtracking
+_AMOUNT = r'\d[\d,]*(?:\.\d+)?'
+_CODES = '|'.join(sorted(list(CURRENCIES) + list(CURRENCY_ALIASES), key=len, reverse=True))
+
+PRICE_PATTERN = (
+    r'^(?:'
+    rf'(?P<price>(?P<low>{_AMOUNT})(?:\s*(?:-|to)\s*(?P<high>{_AMOUNT}))?\s*(?P<currency>{_CODES}))\b'
+    r'(?:\s*(?P<basis>Premium|Hammer))?'
+    rf'(?:\s*\((?P<usd>(?P<usd_low>{_AMOUNT})(?:\s*(?:-|to)\s*(?P<usd_high>{_AMOUNT}))?\s*USD)\))?'
+    r'|(?P<status>' + '|'.join(LOT_STATUSES) + r'))'
+)
+PRICE_RE = re.compile(PRICE_PATTERN)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def amount(text: Optional[str]) -> Optional[float]:
+    """Convert "1,200,000" to 1200000.0; None stays None."""
+    return float(text.replace(",", "")) if text else None
+
+
+def currency_code(text: str) -> str:
+    """Return the ISO code for a currency as written, e.g. "RMB" -> "CNY"."""
+    return CURRENCY_ALIASES.get(text, text)
+
+
+def _text(match: re.Match, group: str) -> str:
+    value = match.group(group)
+    return _WHITESPACE_RE.sub(' ', value.strip()) if value else ""
+
+
+def estimate_columns(match: re.Match) -> Dict[str, Any]:
+    """
+    Columns of an Estimate line.
+
+    "800,000 - 1,200,000 HKD (102,847 - 154,271 USD)" gives the text as
+    "Estimate Price" plus numeric low/high in the sale currency and in USD.
+    A single-figure estimate has equal low and high.
+    """
+    if match.group("status"):
+        return {"Estimate Price": match.group("status")}
+    currency = currency_code(match.group("currency"))
+    low = amount(match.group("low"))
+    high = amount(match.group("high")) if match.group("high") else low
+    columns: Dict[str, Any] = {
+        "Estimate Price": _WHITESPACE_RE.sub(' ', match.group(0).strip()),
+        "Estimate Low": low,
+        "Estimate High": high,
+        "Estimate Currency": currency,
+    }
+    if match.group("usd"):
+        usd_low = amount(match.group("usd_low"))
+        columns["Estimate Low (USD)"] = usd_low
+        columns["Estimate High (USD)"] = amount(match.group("usd_high")) if match.group("usd_high") else usd_low
+    elif currency == "USD":
+        columns["Estimate Low (USD)"] = low
+        columns["Estimate High (USD)"] = high
+    return columns
+
+
+def sold_columns(match: re.Match) -> Dict[str, Any]:
+    """
+    Columns of a Sold For line.
+
+    "441,000 HKD Premium (56,724 USD)" gives "Sold Price" as
+    "441,000 HKD (56,724 USD)", the amount as "Premium Price" (or "Hammer
+    Price"), the currency and the USD value. A status such as "Bought In"
+    is kept as the "Sold Price" text only.
+    """
+    if match.group("status"):
+        return {"Sold Price": match.group("status")}
+    currency = currency_code(match.group("currency"))
+    price = _text(match, "price")
+    usd_text = _text(match, "usd")
+    value = amount(match.group("low"))
+    columns: Dict[str, Any] = {
+        "Sold Price": f"{price} ({usd_text})" if usd_text else price,
+        "Sold Currency": currency,
+    }
+    basis = match.group("basis")
+    if basis:
+        columns[f"{basis} Price"] = value
+    if usd_text:
+        columns["Sold Price (USD)"] = amount(match.group("usd_low"))
+    elif currency == "USD":
+        columns["Sold Price (USD)"] = value
+    return columns
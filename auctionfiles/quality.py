@@ -0,0 +1,161 @@
+import csv
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+# Data-quality checks run on each record as it is parsed.
+#
+# Every record gets a "Quality Score" (the share of applicable checks it
+# passes) and "Quality Flags" (the checks it failed), so suspect rows can be
+# filtered straight from the CSV. QualityReport tallies flags and field
+# coverage per file, to rank parser fixes by the number of rows they affect.
+
+SCORE_COLUMN = "Quality Score"
+FLAGS_COLUMN = "Quality Flags"
+
+# Labels that end up in the artist when an entry is cut in the wrong place
+_LABEL_WORDS_RE = re.compile(
+    r'\b(?:Title|Description|Medium|Year of Work|Size|Misc|Sale of|Estimate|Sold For)\b'
+)
+# Lower-case words that do belong in names ("Willem de Kooning")
+NAME_PARTICLES = {
+    "van", "von", "de", "der", "den", "da", "di", "du", "del", "della", "la", "le",
+    "y", "e", "al", "el", "ten", "ter", "zu", "and",
+}
+MAX_ARTIST_WORDS = 5
+
+
+def _artist_plausible(artist: str) -> bool:
+    if not artist or "\n" in artist or _LABEL_WORDS_RE.search(artist):
+        return False
+    words = artist.split()
+    if len(words) > MAX_ARTIST_WORDS or not words[0][0].isupper():
+        return False
+    return all(word[0].isupper() or word.lower() in NAME_PARTICLES for word in words)
+
+
+def quality_flags(record: Dict[str, Any]) -> List[Optional[str]]:
+    """
+    Run every check that applies to a record.
+
+    Returns:
+        list: One entry per applicable check: None if it passed, else its flag
+    """
+    results: List[Optional[str]] = []
+
+    if record.get("Size Check"):
+        mismatch = record["Size Check"] == "mismatch"
+        depth = record.get("Depth (cm)")
+        faces = [record.get("Height (cm)"), record.get("Width (cm)")]
+        # A "depth" deeper than the work is tall and wide on a flat work is
+        # usually a centimetre value read as inches or a misplaced dimension
+        if depth and record.get("Dimensionality") == "2D" and all(face and depth > face for face in faces):
+            mismatch = True
+        results.append("size_units" if mismatch else None)
+
+    low, high = record.get("Estimate Low"), record.get("Estimate High")
+    if low is not None and high is not None:
+        results.append("estimate_order" if low > high else None)
+
+    estimate_currency, sold_currency = record.get("Estimate Currency"), record.get("Sold Currency")
+    if estimate_currency and sold_currency:
+        results.append("currency_mismatch" if estimate_currency != sold_currency else None)
+
+    results.append(None if _artist_plausible(record.get("Artist") or "") else "artist")
+    return results
+
+
+def score_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the quality score and flags to a parsed record, in place, and return it."""
+    results = quality_flags(record)
+    flags = [flag for flag in results if flag]
+    record[SCORE_COLUMN] = round(1 - len(flags) / len(results), 2)
+    record[FLAGS_COLUMN] = ";".join(flags)
+    return record
+
+
+class QualityReport:
+    """Per-file and per-field coverage and check failures of parsed records."""
+
+    def __init__(self):
+        self._files: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, document: str, records: Iterable[Dict[str, Any]]) -> None:
+        """Tally the records parsed from one document."""
+        tally = self._files.setdefault(document, {"rows": 0, "score": 0.0, "fields": {}, "flags": {}})
+        for record in records:
+            tally["rows"] += 1
+            tally["score"] += record.get(SCORE_COLUMN, 1.0)
+            for name, value in record.items():
+                if name in (SCORE_COLUMN, FLAGS_COLUMN):
+                    continue
+                if value is not None and value != "":
+                    tally["fields"][name] = tally["fields"].get(name, 0) + 1
+                else:
+                    tally["fields"].setdefault(name, 0)
+            for flag in filter(None, (record.get(FLAGS_COLUMN) or "").split(";")):
+                tally["flags"][flag] = tally["flags"].get(flag, 0) + 1
+
+    def _totals(self) -> Dict[str, Any]:
+        totals: Dict[str, Any] = {"rows": 0, "score": 0.0, "fields": {}, "flags": {}}
+        for tally in self._files.values():
+            totals["rows"] += tally["rows"]
+            totals["score"] += tally["score"]
+            for key in ("fields", "flags"):
+                for name, count in tally[key].items():
+                    totals[key][name] = totals[key].get(name, 0) + count
+        return totals
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """
+        The report in long form: one row per (file, field) and (file, check).
+
+        Coverage rows count the records with a value, check rows the records
+        that failed; File is "(all)" for the totals.
+        """
+        rows = []
+        tallies = [("(all)", self._totals())] + sorted(self._files.items())
+        fields = list(tallies[0][1]["fields"])
+        for document, tally in tallies:
+            total = tally["rows"]
+            for name in fields:
+                count = tally["fields"].get(name, 0)
+                rows.append({"File": document, "Kind": "field", "Name": name, "Rows": total,
+                             "Count": count, "Share": round(count / total, 4) if total else 0.0})
+            for name, count in sorted(tally["flags"].items(), key=lambda item: -item[1]):
+                rows.append({"File": document, "Kind": "check", "Name": name, "Rows": total,
+                             "Count": count, "Share": round(count / total, 4) if total else 0.0})
+        return rows
+
+    def write_csv(self, output_csv: str) -> None:
+        tmp_path = f"{output_csv}.tmp"
+        with open(tmp_path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=["File", "Kind", "Name", "Rows", "Count", "Share"])
+            writer.writeheader()
+            writer.writerows(self.rows())
+        os.replace(tmp_path, output_csv)
+
+    def format(self, top: int = 10) -> str:
+        """Render the report as plain text: failed checks, sparsest fields, then files."""
+        totals = self._totals()
+        rows = totals["rows"]
+        lines = [f"Quality of {rows} records from {len(self._files)} files"]
+        if not rows:
+            return lines[0]
+
+        lines += ["", "Checks by rows affected:"]
+        for name, count in sorted(totals["flags"].items(), key=lambda item: -item[1]):
+            lines.append(f"{name:<24}{count:>8}{count / rows:>9.1%}")
+        if not totals["flags"]:
+            lines.append("(no failures)")
+
+        lines += ["", f"Least covered fields (top {top}):"]
+        for name, count in sorted(totals["fields"].items(), key=lambda item: item[1])[:top]:
+            lines.append(f"{name:<24}{count:>8}{count / rows:>9.1%}")
+
+        lines += ["", f"{'file':<48}{'rows':>6}{'score':>8}{'flags':>7}"]
+        for document, tally in sorted(self._files.items()):
+            flags = sum(tally["flags"].values())
+            mean = tally["score"] / tally["rows"] if tally["rows"] else 0.0
+            lines.append(f"{document[:47]:<48}{tally['rows']:>6}{mean:>8.2f}{flags:>7}")
+        return "\n".join(lines)
@@ -0,0 +1,90 @@
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+# Typed values of parsed auction records.
+#
+# Sale strings repeat for every lot of a sale, so the parsers here are
+# memoized: a corpus with thousands of lots only parses each sale once.
+
+SALE_DATE_FORMATS = ("%A, %B %d, %Y", "%B %d, %Y", "%d %B %Y", "%Y-%m-%d")
+SALE_CACHE_SIZE = 16384
+
+# Cities auction houses put in their names, longest first so "New York" wins over "York"
+SALE_CITIES = sorted([
+    "New York", "London", "Hong Kong", "Paris", "Shanghai", "Beijing", "Taipei", "Seoul",
+    "Tokyo", "Singapore", "Geneva", "Zurich", "Milan", "Amsterdam", "Cologne", "Munich",
+    "Berlin", "Vienna", "Stockholm", "Copenhagen", "Brussels", "Madrid", "Monaco", "Dubai",
+    "Doha", "Mumbai", "Jakarta", "Sydney", "Melbourne", "Toronto", "Los Angeles", "Chicago",
+    "San Francisco", "Palm Beach", "Miami", "Dallas", "Online",
+], key=len, reverse=True)
+CITY_ALIASES = {"HK": "Hong Kong", "NY": "New York"}
+
+_CITY_RE = re.compile(
+    r'\b(' + '|'.join(re.escape(city) for city in SALE_CITIES + list(CITY_ALIASES)) + r')\b'
+)
+_USD_RE = re.compile(r'([\d,]+(?:\.\d+)?)\s*USD\)?\s*$')
+
+
+def to_float(value: Any) -> Optional[float]:
+    """Return a numeric column value as a float, or None if it is missing."""
+    if value is None or value == "":
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if number != number else number  # NaN from pandas
+
+
+@lru_cache(maxsize=SALE_CACHE_SIZE)
+def parse_sale_date(text: str) -> Optional[date]:
+    """Parse a sale date such as "Thursday, November 21, 2024"; memoized."""
+    text = text.strip()
+    for date_format in SALE_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=SALE_CACHE_SIZE)
+def sale_city(auction_house: str) -> str:
+    """Return the city in an auction house name, e.g. "Sotheby's Hong Kong" -> "Hong Kong"."""
+    cities = _CITY_RE.findall(auction_house)
+    if not cities:
+        return ""
+    city = cities[-1]
+    return CITY_ALIASES.get(city, city)
+
+
+def sale_date(record: Dict[str, Any]) -> Optional[datetime]:
+    """Return the sale date of a record, preferring the ISO column written during parsing."""
+    value = record.get("Sale Date ISO")
+    if value and isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    value = record.get("Sale Date")
+    if not value or not isinstance(value, str):
+        return None
+    parsed = parse_sale_date(value)
+    return datetime(parsed.year, parsed.month, parsed.day) if parsed else None
+
+
+def sold_usd(record: Dict[str, Any]) -> Optional[float]:
+    """Return the USD value of a sold price such as "600,000 HKD (77,135 USD)"."""
+    # Parsed by prices.sold_columns; older CSVs only have the text column
+    usd = to_float(record.get("Sold Price (USD)"))
+    if usd is not None:
+        return usd
+    value = record.get("Sold Price")
+    if not value or not isinstance(value, str):
+        return None
+    usd_match = _USD_RE.search(value)
+    if usd_match:
+        return float(usd_match.group(1).replace(",", ""))
+    return None
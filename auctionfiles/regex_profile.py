@@ -0,0 +1,165 @@
+import argparse
+import heapq
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Diagnostic mode: time every extraction pattern against every entry of a
+# corpus and report the slowest patterns and the entries that trigger them.
+#
+#   python regex_profile.py "C:\Users\haoyu\Downloads\auctionfiles" --top 20
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+from dimensions import _DIMENSION_RE, _MEDIUM_RE, _SIZE_BLOCK_RE  # noqa: E402
+from schema import ExtractionPlan, compile_plan  # noqa: E402
+
+TOP_N = 10
+
+
+class PatternStats:
+    """Timing totals for one pattern."""
+
+    __slots__ = ("calls", "total", "worst", "worst_entry")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.worst_entry: Optional[Tuple[str, int]] = None
+
+    def add(self, seconds: float, entry_id: Tuple[str, int]) -> None:
+        self.calls += 1
+        self.total += seconds
+        if seconds > self.worst:
+            self.worst = seconds
+            self.worst_entry = entry_id
+
+
+def _timed(search, text: str) -> float:
+    start = time.perf_counter()
+    search(text)
+    return time.perf_counter() - start
+
+
+def _entry_patterns(plan: ExtractionPlan, entry: str) -> Iterable[Tuple[str, Any, str]]:
+    """Yield (pattern name, compiled pattern method, input text) for one entry."""
+    yield "labels", plan.label_re.findall, entry
+    segments = plan.segments(entry)
+    for field in plan.fields:
+        if field.pattern is None:
+            continue
+        segment, source = plan.inputs(field, segments, entry)
+        if segment is not None:
+            yield field.spec.name, field.pattern.match, segment
+        if source:
+            # Fallbacks are timed even when the primary pattern matched, to
+            # expose the worst case rather than the common path
+            for number, fallback in enumerate(field.fallbacks, 1):
+                yield f"{field.spec.name} fallback {number}", fallback.search, source
+
+    block = _SIZE_BLOCK_RE.search(entry)
+    yield "size block", _SIZE_BLOCK_RE.search, entry
+    yield "dimensions", _DIMENSION_RE.findall, block.group(1) if block else entry
+    yield "dimensions medium", _MEDIUM_RE.search, entry
+
+
+def profile_entries(entries: Iterable[Tuple[str, str]], plan: Optional[ExtractionPlan] = None,
+                    top: int = TOP_N) -> Dict[str, Any]:
+    """
+    Time every pattern against every entry.
+
+    Args:
+        entries: (document name, entry text) pairs
+        plan: Extraction plan to profile (default: the Artnet schema)
+        top: Number of worst (pattern, entry) pairs to keep
+
+    Returns:
+        dict: Per-pattern statistics, the worst pairs and the entry texts they refer to
+    """
+    plan = plan or compile_plan()
+    stats: Dict[str, PatternStats] = {}
+    worst: List[Tuple[float, str, Tuple[str, int]]] = []
+    texts: Dict[Tuple[str, int], str] = {}
+    counters: Dict[str, int] = {}
+    entry_count = 0
+
+    for document, entry in entries:
+        index = counters.get(document, 0)
+        counters[document] = index + 1
+        entry_id = (document, index)
+        entry_count += 1
+        for name, search, text in _entry_patterns(plan, entry):
+            seconds = _timed(search, text)
+            stats.setdefault(name, PatternStats()).add(seconds, entry_id)
+            item = (seconds, name, entry_id)
+            if len(worst) < top:
+                heapq.heappush(worst, item)
+            elif seconds > worst[0][0]:
+                heapq.heapreplace(worst, item)
+            else:
+                continue
+            texts[entry_id] = entry
+
+    worst.sort(reverse=True)
+    kept = {entry_id for _, _, entry_id in worst}
+    return {
+        "entries": entry_count,
+        "patterns": stats,
+        "worst": worst,
+        "texts": {entry_id: text for entry_id, text in texts.items() if entry_id in kept},
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render a profile as a plain-text report."""
+    lines = [f"Profiled {report['entries']} entries", "", "Patterns by total time:"]
+    lines.append(f"{'pattern':<28}{'calls':>8}{'total ms':>11}{'mean us':>10}{'max us':>10}  worst entry")
+    ranked = sorted(report["patterns"].items(), key=lambda item: item[1].total, reverse=True)
+    for name, stats in ranked:
+        mean = stats.total / stats.calls if stats.calls else 0.0
+        document, index = stats.worst_entry or ("", -1)
+        lines.append(
+            f"{name:<28}{stats.calls:>8}{stats.total * 1e3:>11.2f}{mean * 1e6:>10.1f}"
+            f"{stats.worst * 1e6:>10.1f}  {document} #{index}"
+        )
+
+    lines += ["", "Slowest pattern/entry pairs:"]
+    for seconds, name, entry_id in report["worst"]:
+        text = report["texts"].get(entry_id, "")
+        first_line = text.strip().splitlines()[0] if text.strip() else ""
+        lines.append(
+            f"{seconds * 1e6:>10.1f} us  {name:<28} {entry_id[0]} #{entry_id[1]} "
+            f"({len(text)} chars) {first_line[:60]}"
+        )
+    return "\n".join(lines)
+
+
+def folder_entries(folder_path: str) -> Iterable[Tuple[str, str]]:
+    """Yield (file name, entry) pairs for every PDF in a folder."""
+    from dc4 import extract_pages
+    from pages import clean_pages, iter_entries
+
+    for pdf_file in sorted(os.listdir(folder_path)):
+        if not pdf_file.lower().endswith(".pdf"):
+            continue
+        page_texts, _ = extract_pages(os.path.join(folder_path, pdf_file))
+        for entry in iter_entries(clean_pages(page_texts)):
+            yield pdf_file, entry
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time every extraction pattern against real entries.")
+    parser.add_argument("folder", help="Folder of Artnet PDF exports")
+    parser.add_argument("--top", type=int, default=TOP_N, help="Number of worst pairs to show")
+    args = parser.parse_args()
+
+    report = profile_entries(folder_entries(args.folder), top=args.top)
+    print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
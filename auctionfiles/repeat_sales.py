@@ -0,0 +1,224 @@
+import re
+from difflib import SequenceMatcher
+from itertools import product
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from records import sale_date, sold_usd, to_float
+
+# Links repeat sales of the same work and derives holding periods and returns.
+#
+# Records are first blocked on artist, year of work, medium tokens and rounded
+# dimensions; only records sharing a block are compared, so the work grows
+# with the size of the blocks rather than with the square of the corpus.
+
+# Width of a dimension bucket; a size near a bucket edge is also placed in the
+# neighbouring bucket so that 91.4 cm and 91.6 cm still meet
+DIM_BUCKET_CM = 2.0
+EDGE_FRACTION = 0.25
+
+# Largest relative difference in height or width for two lots to be one work
+DIM_TOLERANCE = 0.03
+
+TITLE_WEIGHT = 0.6
+DIM_WEIGHT = 0.4
+MATCH_THRESHOLD = 0.8
+
+# Titles that say nothing about which work it is; they need a size match
+GENERIC_TITLES = {"untitled", "no title", "sans titre", "ohne titel", "composition", "study"}
+
+MEDIUM_STOPWORDS = {"on", "and", "with", "in", "over", "mounted", "stretched", "a", "the", "of"}
+
+_NON_WORD_RE = re.compile(r'[^\w\s]+')
+_SPACE_RE = re.compile(r'\s+')
+
+DAYS_PER_YEAR = 365.25
+# Shorter holds get no annualized return: compounding a few days' change over
+# a year says nothing and overflows for large price ratios
+MIN_ANNUALIZE_DAYS = 90
+
+
+def annualized_return(first_price: float, second_price: float, days: int) -> Optional[float]:
+    """Compound annual return between two prices, or None for holds under MIN_ANNUALIZE_DAYS."""
+    if days < MIN_ANNUALIZE_DAYS:
+        return None
+    try:
+        return (second_price / first_price) ** (DAYS_PER_YEAR / days) - 1
+    except OverflowError:
+        return None
+
+
+def normalise_title(title: str) -> str:
+    """Lower-case a title and drop punctuation, e.g. "Untitled (Study)" -> "untitled study"."""
+    title = _NON_WORD_RE.sub(' ', (title or '').lower())
+    return _SPACE_RE.sub(' ', title).strip()
+
+
+def medium_key(medium: str) -> Tuple[str, ...]:
+    """Reduce a medium to its sorted material tokens."""
+    tokens = normalise_title(medium).split()
+    return tuple(sorted({token for token in tokens if token not in MEDIUM_STOPWORDS}))
+
+
+def _buckets(value: Optional[float]) -> List[Optional[int]]:
+    if value is None:
+        return [None]
+    position = value / DIM_BUCKET_CM
+    bucket = int(round(position))
+    offset = position - bucket
+    if offset > 0.5 - EDGE_FRACTION:
+        return [bucket, bucket + 1]
+    if offset < EDGE_FRACTION - 0.5:
+        return [bucket, bucket - 1]
+    return [bucket]
+
+
+def _dimensions(record: Dict[str, Any]) -> Tuple[Optional[float], Optional[float]]:
+    """Height and width in cm, ordered so that a rotated work still matches."""
+    height = to_float(record.get("Height (cm)"))
+    width = to_float(record.get("Width (cm)"))
+    if height is not None and width is not None and height < width:
+        height, width = width, height
+    return height, width
+
+
+def block_keys(record: Dict[str, Any]) -> List[Tuple]:
+    """Return every block a record belongs to."""
+    artist = normalise_title(record.get("Artist") or "")
+    if not artist:
+        return []
+    year = record.get("Year") or None
+    medium = medium_key(record.get("Medium") or "")
+    height, width = _dimensions(record)
+    return [
+        (artist, year, medium, height_bucket, width_bucket)
+        for height_bucket, width_bucket in product(_buckets(height), _buckets(width))
+    ]
+
+
+def _dimension_similarity(a: Dict[str, Any], b: Dict[str, Any]) -> float:
+    a_dims, b_dims = _dimensions(a), _dimensions(b)
+    differences = []
+    for x, y in zip(a_dims, b_dims):
+        if x is None or y is None:
+            return 0.5  # unknown size neither confirms nor rules out
+        differences.append(abs(x - y) / max(x, y, 1e-9))
+    worst = max(differences)
+    return max(0.0, 1.0 - worst / DIM_TOLERANCE) if worst <= DIM_TOLERANCE else 0.0
+
+
+def match_score(a: Dict[str, Any], b: Dict[str, Any]) -> float:
+    """Score how likely two lots are the same work, from 0 to 1."""
+    dims = _dimension_similarity(a, b)
+    if dims == 0.0:
+        return 0.0
+    title_a, title_b = normalise_title(a.get("Title", "")), normalise_title(b.get("Title", ""))
+    if title_a in GENERIC_TITLES or title_b in GENERIC_TITLES:
+        # "Untitled" says nothing; only an exact size match is convincing
+        title = 1.0 if title_a == title_b and dims >= 0.9 else 0.0
+    else:
+        title = SequenceMatcher(None, title_a, title_b).ratio()
+    return TITLE_WEIGHT * title + DIM_WEIGHT * dims
+
+
+def _same_sale(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    return (a.get("Sale Date"), a.get("Auction House"), a.get("Lot Number")) == \
+        (b.get("Sale Date"), b.get("Auction House"), b.get("Lot Number"))
+
+
+def candidate_pairs(records: List[Dict[str, Any]]) -> Set[Tuple[int, int]]:
+    """Return the index pairs that share at least one block."""
+    blocks: Dict[Tuple, List[int]] = {}
+    for index, record in enumerate(records):
+        for key in block_keys(record):
+            blocks.setdefault(key, []).append(index)
+
+    pairs = set()
+    for members in blocks.values():
+        for position, i in enumerate(members):
+            for j in members[position + 1:]:
+                pairs.add((i, j) if i < j else (j, i))
+    return pairs
+
+
+def match_works(records: List[Dict[str, Any]], threshold: float = MATCH_THRESHOLD) -> List[int]:
+    """
+    Group lots that are sales of the same work.
+
+    Returns:
+        list: A work id for every record; matched records share an id
+    """
+    parent = list(range(len(records)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in candidate_pairs(records):
+        if _same_sale(records[i], records[j]):
+            continue
+        if match_score(records[i], records[j]) >= threshold:
+            parent[find(i)] = find(j)
+    return [find(i) for i in range(len(records))]
+
+
+def repeat_sales(records: Iterable[Dict[str, Any]], threshold: float = MATCH_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Build a repeat-sales table from parsed auction records.
+
+    Consecutive sold appearances of the same work form one pair; lots that
+    were bought in or have no USD price are skipped.
+
+    Args:
+        records: Parsed auction records (dicts, e.g. from parse_entries)
+        threshold: Minimum match score for two lots to be the same work
+
+    Returns:
+        list: One row per repeat-sale pair with holding period and returns
+    """
+    records = list(records)
+    works: Dict[int, List[Tuple[Any, float, Dict[str, Any]]]] = {}
+    for work_id, record in zip(match_works(records, threshold), records):
+        date = sale_date(record)
+        price = sold_usd(record)
+        if date is None or not price:
+            continue
+        works.setdefault(work_id, []).append((date, price, record))
+
+    rows = []
+    for sales in works.values():
+        if len(sales) < 2:
+            continue
+        sales.sort(key=lambda sale: sale[0])
+        for (first_date, first_price, first), (second_date, second_price, second) in zip(sales, sales[1:]):
+            days = (second_date - first_date).days
+            if days <= 0:
+                continue
+            rows.append({
+                "Artist": first.get("Artist"),
+                "Title": first.get("Title"),
+                "Second Title": second.get("Title"),
+                "First Sale Date": first_date.date().isoformat(),
+                "First Auction House": first.get("Auction House"),
+                "First Price (USD)": first_price,
+                "Second Sale Date": second_date.date().isoformat(),
+                "Second Auction House": second.get("Auction House"),
+                "Second Price (USD)": second_price,
+                "Holding Days": days,
+                "Total Return": second_price / first_price - 1,
+                "Annualized Return": annualized_return(first_price, second_price, days),
+                "Match Score": round(match_score(first, second), 3),
+            })
+    rows.sort(key=lambda row: (row["Artist"] or "", row["First Sale Date"]))
+    return rows
+
+
+def write_repeat_sales(records: Iterable[Dict[str, Any]], output_csv: str) -> int:
+    """Write the repeat-sales table to a CSV and return the number of pairs."""
+    import pandas as pd
+
+    rows = repeat_sales(records)
+    pd.DataFrame(rows).to_csv(output_csv, index=False)
+    print(f"Found {len(rows)} repeat-sale pairs; saved to {output_csv}")
+    return len(rows)
@@ -0,0 +1,249 @@
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Pattern, Sequence, Tuple
+
+from prices import PRICE_PATTERN, estimate_columns, sold_columns
+from records import SALE_CACHE_SIZE, parse_sale_date, sale_city
+
+# Declarative description of the fields in an Artnet lot entry.
+#
+# Each labelled field starts its own line in the export ("Title ...",
+# "Sale of ..."). compile_plan() merges every label into one master regex, so
+# an entry is cut into per-label segments in a single pass and each value
+# pattern only ever sees its own segment. Adding a field or a new layout means
+# adding a FieldSpec, not copying the script.
+
+# Patterns only see this many characters of their input: value patterns the
+# start of their segment, fallbacks the start of their source. Real fields are
+# far shorter; the caps bound the cost of patterns on runaway entries by input
+# size, so the result never depends on machine load. Within that, gaps in a
+# fallback are bounded too ("[^\n]{0,200}?", not ".*?"): two unbounded lazy
+# gaps cost the cube of the source length, seconds even at 4000 characters.
+MAX_SEGMENT_CHARS = 4000
+MAX_FALLBACK_CHARS = 4000
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def clean_match(match: Optional[re.Match], group: int = 1) -> str:
+    """Return a match group with its whitespace collapsed, or an empty string."""
+    if match and match.group(group):
+        return _WHITESPACE_RE.sub(' ', match.group(group).strip())
+    return ""
+
+
+class FieldSpec(NamedTuple):
+    """
+    One field of an auction record.
+
+    Attributes:
+        name: Output column (ignored when cleaner returns several columns)
+        label: Text that starts the field's line, or None for the lines
+            before the first label
+        pattern: Value pattern matched at the start of the field's segment; None for
+            fields filled from precomputed values (see ExtractionPlan.extract)
+        fallbacks: Patterns tried in order when the label or pattern misses
+        fallback_source: Label of the segment the fallbacks search, or None
+            for the whole entry
+        type: Conversion applied to a single cleaned value
+        cleaner: Turns a match into a value, or into a dict of columns
+        fallback_cleaner: Cleaner for a fallback match, if it differs
+        flags: Regex flags for pattern and fallbacks
+        default: Value emitted when nothing matches; None leaves the column out
+        emit: False for fields only used as a fallback source
+    """
+    name: str
+    label: Optional[str]
+    pattern: Optional[str]
+    fallbacks: Tuple[str, ...] = ()
+    fallback_source: Optional[str] = None
+    type: Callable[[str], Any] = str
+    cleaner: Callable[[re.Match], Any] = clean_match
+    fallback_cleaner: Optional[Callable[[re.Match], Any]] = None
+    flags: int = 0
+    default: Optional[Any] = None
+    emit: bool = True
+
+
+@lru_cache(maxsize=SALE_CACHE_SIZE)
+def _sale_parts(sale_text: str) -> Tuple[Tuple[str, str], ...]:
+    """Split "Sotheby's London: Thursday, October 10, 2024" into typed columns; memoized."""
+    # Split auction house and date if possible
+    parts = sale_text.split(':', 1)
+    house = parts[0].strip()
+    columns = [("Auction House", house)]
+    city = sale_city(house)
+    if city:
+        columns.append(("Sale City", city))
+    if len(parts) > 1:
+        date_text = parts[1].strip()
+        columns.append(("Sale Date", date_text))
+        parsed = parse_sale_date(date_text)
+        if parsed:
+            columns.append(("Sale Date ISO", parsed.isoformat()))
+    return tuple(columns)
+
+
+def _lower_match(match: re.Match) -> str:
+    """clean_match, lower-cased: "Oil on Canvas" -> "oil on canvas"."""
+    return clean_match(match).lower()
+
+
+def _sale_columns(match: re.Match) -> Dict[str, str]:
+    """Columns of a "Sale of" line: house, city, date, lot and auction name."""
+    columns = dict(_sale_parts(clean_match(match, 1)))
+    columns["Lot Number"] = clean_match(match, 2)
+    columns["Auction Name"] = clean_match(match, 3)
+    return columns
+
+
+ARTNET_FIELDS: List[FieldSpec] = [
+    # "12 Avery Singer" - the line before the first label
+    FieldSpec("Artist", None, r'^\d+\s+([A-Za-z\s]+)'),
+    FieldSpec("Title", "Title", r'(.+)', flags=re.DOTALL, default=""),
+    FieldSpec("Description", "Description", r'(.+)', flags=re.DOTALL, emit=False),
+    FieldSpec(
+        "Medium", "Medium", r'(.+)',
+        fallbacks=(r'((?:oil|acrylic) on.{0,200}?(?:canvas|paper|board|wood|panel))(?=\s|,|$)',),
+        fallback_source="Description",
+        fallback_cleaner=_lower_match,
+        flags=re.DOTALL | re.IGNORECASE,
+    ),
+    FieldSpec(
+        "Year", "Year of Work", r'(?:circa|ca\.|c\.)?\s*(\d{4})',
+        fallbacks=(
+            r'dated\s*[\'"]?(\d{4})',
+            r'signed\b[^\n]{0,200}?dated\D{0,40}(\d{4})',
+            r'created in\s*(\d{4})',
+            r',\s*(\d{4})(?=\s|$)',
+        ),
+        flags=re.IGNORECASE,
+    ),
+    # Parsed in bulk by dimensions.parse_dimensions
+    FieldSpec("Size", "Size", None),
+    FieldSpec("Misc", r'Misc\.', r'(.+)', flags=re.DOTALL),
+    FieldSpec(
+        "Sale", "Sale of", r'(.*?)\s*\[Lot\s*(\d+\s*[A-Z]?)\]\s*(.*)',
+        cleaner=_sale_columns, flags=re.DOTALL,
+    ),
+    # Both price lines share one pattern built from the currency table in prices.py
+    FieldSpec("Estimate Price", "Estimate", PRICE_PATTERN, cleaner=estimate_columns, default=""),
+    FieldSpec("Sold Price", "Sold For", PRICE_PATTERN, cleaner=sold_columns),
+]
+
+
+class CompiledField(NamedTuple):
+    spec: FieldSpec
+    pattern: Optional[Pattern]
+    fallbacks: Tuple[Pattern, ...]
+
+
+class ExtractionPlan:
+    """
+    A field schema compiled for the hot loop.
+
+    All label alternatives live in one master regex; value patterns and
+    fallbacks are compiled once, and fallbacks are only consulted for fields
+    whose primary pattern missed.
+    """
+
+    def __init__(self, specs: Sequence[FieldSpec]):
+        self.specs = list(specs)
+        labels = [spec.label for spec in self.specs if spec.label]
+        # Longest first so that a label can't shadow a longer one sharing its prefix
+        labels.sort(key=len, reverse=True)
+        self.label_re = re.compile(r'^(' + '|'.join(labels) + r')(?=\s|$)[ \t]*', re.MULTILINE)
+        self._label_keys = {label: self._normalise_label(label) for label in labels}
+        self.fields = [
+            CompiledField(
+                spec,
+                re.compile(spec.pattern, spec.flags) if spec.pattern else None,
+                tuple(re.compile(fallback, spec.flags) for fallback in spec.fallbacks),
+            )
+            for spec in self.specs
+        ]
+
+    @staticmethod
+    def _normalise_label(label: str) -> str:
+        return label.replace('\\', '')
+
+    def segments(self, entry: str) -> Dict[Optional[str], str]:
+        """
+        Cut an entry into segments keyed by label.
+
+        The text before the first label is keyed by None. Only the first
+        occurrence of a label is kept.
+        """
+        segments: Dict[Optional[str], str] = {}
+        position = 0
+        current: Optional[str] = None
+        for match in self.label_re.finditer(entry):
+            segments.setdefault(current, entry[position:match.start()])
+            current = match.group(1)
+            position = match.end()
+        segments.setdefault(current, entry[position:])
+        return segments
+
+    def inputs(self, field: CompiledField, segments: Dict[Optional[str], str],
+               entry: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return the text a field's pattern matches and the text its fallbacks search."""
+        spec = field.spec
+        segment = segments.get(self._label_keys.get(spec.label) if spec.label else None)
+        if segment is not None:
+            if spec.label is None:
+                segment = segment.strip()
+            segment = segment[:MAX_SEGMENT_CHARS]
+        source = entry if spec.fallback_source is None else segments.get(spec.fallback_source)
+        if source is not None:
+            source = source[:MAX_FALLBACK_CHARS]
+        return segment, source
+
+    def extract(self, entry: str, precomputed: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Extract every field of one entry.
+
+        Args:
+            entry: Raw text of one lot
+            precomputed: Columns for pattern-less fields, keyed by field name
+
+        Returns:
+            dict: Output columns in schema order
+        """
+        segments = self.segments(entry)
+        record: Dict[str, Any] = {}
+        for field in self.fields:
+            spec = field.spec
+            if field.pattern is None:
+                if precomputed and spec.name in precomputed:
+                    record.update(precomputed[spec.name])
+                continue
+
+            segment, source = self.inputs(field, segments, entry)
+            match = None
+            if segment is not None:
+                # Anchored at the segment start: an unanchored search retries
+                # every offset and goes quadratic on a long segment
+                match = field.pattern.match(segment)
+            cleaner = spec.cleaner
+            if match is None and field.fallbacks and source:
+                for fallback in field.fallbacks:
+                    match = fallback.search(source)
+                    if match:
+                        cleaner = spec.fallback_cleaner or cleaner
+                        break
+
+            value = cleaner(match) if match else None
+            if isinstance(value, dict):
+                if spec.emit:
+                    record.update(value)
+            elif value:
+                if spec.emit:
+                    record[spec.name] = spec.type(value)
+            elif spec.default is not None and spec.emit:
+                record[spec.name] = spec.default
+        return record
+
+
+def compile_plan(specs: Sequence[FieldSpec] = ARTNET_FIELDS) -> ExtractionPlan:
+    """Compile a field schema into an extraction plan."""
+    return ExtractionPlan(specs)
@@ -0,0 +1,286 @@
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# Long-lived parsing service. Parsing runs in a pool of warm worker processes;
+# results are cached in memory by content hash.
+#
+#   python service.py --port 8765
+#   curl --data-binary @export.pdf -H "Content-Type: application/pdf" localhost:8765/parse
+#   curl --data-binary @export.txt -H "Content-Type: text/plain" "localhost:8765/parse?format=arrow"
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+CACHE_SIZE = 256
+MAX_UPLOAD_BYTES = 200 * 1024 * 1024
+MAX_HEADER_BYTES = 64 * 1024
+
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+OUTPUT_FORMATS = ("json", "arrow")
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 415: "Unsupported Media Type", 500: "Internal Server Error",
+    501: "Not Implemented",
+}
+
+
+def _warm_worker() -> None:
+    """Import the heavy dependencies once per worker instead of once per request."""
+    for module in ("pdfplumber", "pandas"):
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+    import dc4  # noqa: F401
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+def parse_pdf_bytes(data: bytes) -> List[Dict[str, Any]]:
+    """Extract and parse an uploaded PDF. Runs in a worker process."""
+    from dc4 import extract_pages, parse_entries
+    from pages import clean_pages, iter_entries
+
+    page_texts, _ = extract_pages(io.BytesIO(data))
+    return parse_entries(iter_entries(clean_pages(page_texts)))
+
+
+def parse_text(text: str) -> List[Dict[str, Any]]:
+    """Parse pre-extracted text; form feeds, if present, separate pages. Runs in a worker process."""
+    from dc4 import parse_entries
+    from pages import clean_pages, iter_entries
+
+    return parse_entries(iter_entries(clean_pages(text.split("\f"))))
+
+
+def records_to_arrow(records: List[Dict[str, Any]]) -> bytes:
+    """Serialise records as an Arrow IPC stream."""
+    import pyarrow as pa
+
+    table = pa.Table.from_pylist(records)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+class ParseCache:
+    """LRU cache of parse results keyed by the SHA-256 of the request body."""
+
+    def __init__(self, max_entries: int = CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        records = self._entries.get(key)
+        if records is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return records
+
+    def put(self, key: str, records: List[Dict[str, Any]]) -> None:
+        self._entries[key] = records
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ParseService:
+    """
+    Minimal asyncio HTTP/1.1 server around the parser.
+
+    Endpoints:
+        POST /parse   body is a PDF (application/pdf) or text (text/plain);
+                      ?format=json (default) or ?format=arrow
+        GET  /health  worker count and cache statistics
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, cache_size: int = CACHE_SIZE):
+        self.workers = workers
+        self.cache = ParseCache(cache_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Identical uploads arriving together share one parse
+        self._in_flight: Dict[str, "asyncio.Future[List[Dict[str, Any]]]"] = {}
+
+    def start_workers(self) -> None:
+        """
+        Start and warm every worker before the first request arrives.
+
+        The pool only spawns processes on submit, so one task per worker is
+        submitted and awaited here. Otherwise the first upload would pay the
+        import cost, and workers forked while a connection is open would keep
+        its socket and stop the client from seeing the connection close.
+        """
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        ready = [self._executor.submit(_worker_ready) for _ in range(self.workers)]
+        for future in ready:
+            future.result()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def parse(self, body: bytes, content_type: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """Return parsed records for a request body and whether they came from the cache."""
+        is_pdf = content_type == "application/pdf" or body.startswith(b"%PDF")
+        key = ("pdf:" if is_pdf else "text:") + hashlib.sha256(body).hexdigest()
+
+        records = self.cache.get(key)
+        if records is not None:
+            return records, True
+        if key in self._in_flight:
+            return await asyncio.shield(self._in_flight[key]), True
+
+        loop = asyncio.get_running_loop()
+        if is_pdf:
+            future = loop.run_in_executor(self._executor, parse_pdf_bytes, body)
+        else:
+            future = loop.run_in_executor(self._executor, parse_text, body.decode("utf-8", errors="replace"))
+        self._in_flight[key] = future
+        try:
+            records = await future
+        finally:
+            del self._in_flight[key]
+        self.cache.put(key, records)
+        return records, False
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            status, content_type, payload = await self._respond(reader)
+        except Exception as e:
+            print(f"Error handling request: {str(e)}")
+            status, content_type, payload = _json_response(500, {"error": str(e)})
+        header = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(header.encode("latin-1") + payload)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _respond(self, reader: asyncio.StreamReader) -> Tuple[int, str, bytes]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            return _json_response(400, {"error": "malformed request"})
+        if len(head) > MAX_HEADER_BYTES:
+            return _json_response(400, {"error": "headers too large"})
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            return _json_response(400, {"error": "malformed request line"})
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        url = urlsplit(target)
+        if url.path == "/health":
+            return _json_response(200, {
+                "workers": self.workers,
+                "cache_entries": len(self.cache),
+                "cache_hits": self.cache.hits,
+                "cache_misses": self.cache.misses,
+            })
+        if url.path != "/parse":
+            return _json_response(404, {"error": f"unknown path {url.path}"})
+        if method != "POST":
+            return _json_response(405, {"error": "use POST"})
+
+        output_format = parse_qs(url.query).get("format", ["json"])[0]
+        if output_format not in OUTPUT_FORMATS:
+            return _json_response(400, {
+                "error": f"unknown format {output_format!r}; use one of {', '.join(OUTPUT_FORMATS)}"
+            })
+
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            return _json_response(400, {"error": "invalid Content-Length"})
+        if length > MAX_UPLOAD_BYTES:
+            return _json_response(413, {"error": f"upload exceeds {MAX_UPLOAD_BYTES} bytes"})
+        try:
+            body = await reader.readexactly(length)
+        except asyncio.IncompleteReadError:
+            return _json_response(400, {"error": "incomplete body"})
+        if not body:
+            return _json_response(400, {"error": "empty body"})
+
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type and content_type not in ("application/pdf", "text/plain", "application/octet-stream"):
+            return _json_response(415, {"error": f"unsupported content type {content_type}"})
+
+        records, cached = await self.parse(body, content_type)
+
+        if output_format == "arrow":
+            try:
+                return 200, ARROW_MIME, records_to_arrow(records)
+            except ImportError:
+                return _json_response(501, {"error": "pyarrow is not installed"})
+        return _json_response(200, {"count": len(records), "cached": cached, "records": records})
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        self.start_workers()
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        print(f"Serving on http://{host}:{port} with {self.workers} workers")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.shutdown()
+
+
+def _json_response(status: int, body: Dict[str, Any]) -> Tuple[int, str, bytes]:
+    return status, "application/json", json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the Artnet auction parser over HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE)
+    args = parser.parse_args()
+
+    service = ParseService(workers=args.workers, cache_size=args.cache_size)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()